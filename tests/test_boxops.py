@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tomcat.vision import _boxops  # noqa: E402
+
+
+def _expand_box_ref(x1, y1, x2, y2, pad_pct, w, h):
+    """The per-box loop expand_boxes replaced."""
+    pad_x = (x2 - x1) * pad_pct
+    pad_y = (y2 - y1) * pad_pct
+    return (
+        max(0, int(math.floor(x1 - pad_x))),
+        max(0, int(math.floor(y1 - pad_y))),
+        min(w, int(math.ceil(x2 + pad_x))),
+        min(h, int(math.ceil(y2 + pad_y))),
+    )
+
+
+def _random_boxes(rng, n, w, h):
+    a = rng.uniform(-20, [w + 20, h + 20], size=(n, 2))
+    b = rng.uniform(-20, [w + 20, h + 20], size=(n, 2))
+    return np.concatenate([np.minimum(a, b), np.maximum(a, b)], axis=1)
+
+
+_W, _H = 640, 480
+_EDGE = np.array([
+    [0.0, 0.0, 10.0, 10.0],          # touches top-left
+    [630.5, 470.5, 640.0, 480.0],    # touches bottom-right
+    [-5.0, -5.0, 700.0, 500.0],      # larger than the image
+    [100.0, 100.0, 100.0, 100.0],    # zero size
+    [12.25, 7.75, 50.5, 60.125],     # fractional edges
+])
+
+
+def _expected(xyxy, pad_pct):
+    return np.array([_expand_box_ref(*row, pad_pct, _W, _H) for row in xyxy.tolist()], dtype=np.int64).reshape(-1, 4)
+
+
+def _paths():
+    yield "numpy", _boxops._expand_boxes_np
+    if _boxops._expand_boxes_nb is not None:
+        yield "numba", _boxops._expand_boxes_nb
+
+
+@pytest.mark.parametrize("pad_pct", [0.0, 0.1, 0.35])
+def test_expand_boxes_matches_scalar(pad_pct):
+    rng = np.random.default_rng(0)
+    xyxy = np.ascontiguousarray(np.concatenate([_EDGE, _random_boxes(rng, 200, _W, _H)]))
+    want = _expected(xyxy, pad_pct)
+    for name, fn in _paths():
+        got = fn(xyxy, pad_pct, _W, _H)
+        assert got.dtype == np.int64, name
+        np.testing.assert_array_equal(got, want, err_msg=name)
+    np.testing.assert_array_equal(_boxops.expand_boxes(xyxy.tolist(), pad_pct, _W, _H), want)
+
+
+def test_expand_boxes_empty():
+    out = _boxops.expand_boxes([], 0.1, _W, _H)
+    assert out.shape == (0, 4)
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("torch")
+Image = pytest.importorskip("PIL.Image")
+
+from tomcat.vision import vision  # noqa: E402
+
+
+class _FakeTJ:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, arr, **kw):
+        self.calls.append((arr.shape, kw))
+        return b"\xff\xd8tj"
+
+
+def test_jpeg_bytes_uses_turbojpeg(monkeypatch):
+    tj = _FakeTJ()
+    monkeypatch.setattr(vision, "_tj", tj)
+    out = vision._jpeg_bytes(Image.new("RGB", (20, 10)), quality=80)
+    assert out == b"\xff\xd8tj"
+    (shape, kw), = tj.calls
+    assert shape == (10, 20, 3)
+    assert kw["quality"] == 80
+    assert kw["pixel_format"] == vision.TJPF_RGB
+    assert kw["jpeg_subsample"] == vision.TJSAMP_420
+
+
+def test_jpeg_bytes_falls_back_to_pillow(monkeypatch):
+    monkeypatch.setattr(vision, "_tj", None)
+    out = vision._jpeg_bytes(Image.new("RGB", (20, 10)))
+    assert out.startswith(b"\xff\xd8")
+
+
+def test_turbojpeg_enabled_when_installed():
+    tj = pytest.importorskip("turbojpeg")
+    try:
+        tj.TurboJPEG()
+    except Exception:
+        pytest.skip("libturbojpeg not found")
+    assert vision._tj is not None
+
+
+class _FakeCropTJ:
+    def __init__(self, w, h, subsample, colorspace=None):
+        self.header = (w, h, subsample, vision.TJCS_YCbCr if colorspace is None else colorspace)
+        self.crops = []
+
+    def decode_header(self, data):
+        return self.header
+
+    def crop(self, data, x, y, w, h, copynone=False):
+        self.crops.append((x, y, w, h, copynone))
+        return b"crop"
+
+
+def test_lossless_crops_snap_origin_to_mcu(monkeypatch):
+    tj = _FakeCropTJ(100, 80, vision.TJSAMP_420)
+    monkeypatch.setattr(vision, "_tj", tj)
+    out = vision._lossless_jpeg_crops(b"\xff\xd8rest", [[20, 35, 50, 60], [0, 0, 16, 16]])
+    assert out == [b"crop", b"crop"]
+    # 4:2:0 MCUs are 16x16: origins snap down, right/bottom edges stay put
+    assert tj.crops == [(16, 32, 34, 28, True), (0, 0, 16, 16, True)]
+
+
+def test_lossless_crops_clip_to_image(monkeypatch):
+    tj = _FakeCropTJ(100, 80, vision.TJSAMP_444)
+    monkeypatch.setattr(vision, "_tj", tj)
+    vision._lossless_jpeg_crops(b"\xff\xd8rest", [[90, 70, 130, 95], [100, 80, 120, 90]])
+    assert tj.crops == [(88, 64, 12, 16, True), (96, 72, 4, 8, True)]
+
+
+def test_lossless_crops_skip_cmyk_and_non_jpeg(monkeypatch):
+    monkeypatch.setattr(vision, "_tj", _FakeCropTJ(100, 80, vision.TJSAMP_444, colorspace=3))
+    assert vision._lossless_jpeg_crops(b"\xff\xd8rest", [[0, 0, 10, 10]]) is None
+    monkeypatch.setattr(vision, "_tj", _FakeCropTJ(100, 80, vision.TJSAMP_444))
+    assert vision._lossless_jpeg_crops(b"\x89PNG", [[0, 0, 10, 10]]) is None
@@ -1,6 +1,7 @@
 # tomcat/aliases.py
 from __future__ import annotations
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Iterable, Tuple
 
 # One canonical place for both cat and station aliases.
@@ -110,6 +111,7 @@ def alias_vocab() -> Dict[str, List[str]]:
     }
 
 _WS = re.compile(r"\s+")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
 def norm(s: str) -> str:
     return _WS.sub(" ", (s or "").lower().strip())
 
@@ -117,15 +119,31 @@ def _norm(s: str) -> str:
     return _WS.sub(" ", (s or "").lower().strip())
 
 def _words(s: str) -> List[str]:
-    return [w for w in re.split(r"[^a-z0-9]+", _norm(s)) if w]
+    return [w for w in _NON_ALNUM.split(_norm(s)) if w]
 
 def _normalize(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip().lower())
+    return _WS.sub(" ", (s or "").strip().lower())
+
+# Chat repeats short messages ("mike", "fed west", "gm") constantly and the alias tables are
+# static, so resolution is a pure function of the text. Cache short inputs only.
+_RESOLVE_CACHE_MAX_LEN = 64
+
 
 def resolve_station_or_cat(text: str, want: str) -> Optional[str]:
     """Deterministic resolution: whole-word alias first; else unambiguous prefix of an alias token.
     Supports partial nicknames like 'micro' → Microwave, 'tito' → Garfield.
     """
+    if len(text or "") <= _RESOLVE_CACHE_MAX_LEN:
+        return _resolve_station_or_cat_cached(text or "", want)
+    return _resolve_station_or_cat(text, want)
+
+
+@lru_cache(maxsize=2048)
+def _resolve_station_or_cat_cached(text: str, want: str) -> Optional[str]:
+    return _resolve_station_or_cat(text, want)
+
+
+def _resolve_station_or_cat(text: str, want: str) -> Optional[str]:
     text_norm = _normalize(text)
     tokens = set(_words(text_norm))
 
@@ -173,6 +191,17 @@ def resolve_stations(text: str) -> List[str]:
       2) Unambiguous prefix match (3–6 chars) across alias set
     Fuzzy matching lives upstream in the intent router.
     """
+    if len(text or "") <= _RESOLVE_CACHE_MAX_LEN:
+        return list(_resolve_stations_cached(text or ""))
+    return _resolve_stations(text)
+
+
+@lru_cache(maxsize=2048)
+def _resolve_stations_cached(text: str) -> Tuple[str, ...]:
+    return tuple(_resolve_stations(text))
+
+
+def _resolve_stations(text: str) -> List[str]:
     t = f" {_norm(text)} "
     found: List[str] = []
 
@@ -182,9 +182,19 @@ class Settings:
     # Safety/limits
     cv_max_image_dim: int = int(os.getenv("CV_MAX_IMAGE_DIM", "10000"))   # 10K cap on longest side
     cv_max_download_mb: int = int(os.getenv("CV_MAX_DOWNLOAD_MB", "16")) # attachment size cap
+    # With no detections, send the uploaded JPEG back as-is if it's under this size (no re-encode)
+    cv_max_return_bytes: int = int(os.getenv("CV_MAX_RETURN_BYTES", str(8 * 1024 * 1024)))
 
     # Device/precision
     cv_half: bool = os.getenv("CV_FP16", "1").strip().lower() in {"1","true","yes","on"}
+    # Export the detector once to TensorRT (CUDA) / OpenVINO (CPU) and load that instead of the .pt.
+    # Needs tensorrt or openvino installed; falls back to the .pt if export fails.
+    cv_detect_export: bool = os.getenv("CV_DETECT_EXPORT", "0").strip().lower() in {"1","true","yes","on"}
+    # On CPU, run the classifier as an INT8 (statically quantized, QDQ) ONNX Runtime model exported
+    # once next to the checkpoint. Calibrated on the cat photos in cv_clf_calib_dir and only used if
+    # its top-1 agrees with the torch model on them; otherwise (or with no photos) stays on torch.
+    cv_clf_int8: bool = os.getenv("CV_CLF_INT8", "0").strip().lower() in {"1","true","yes","on"}
+    cv_clf_calib_dir: str = os.getenv("CV_CLF_CALIB_DIR", os.path.join("weights", "calib"))
 
     # Temp folder for downloads (repo-local, not hidden OS temp)
     cv_temp_dir: str = os.getenv("CV_TEMP_DIR", "./temp_images")
@@ -213,6 +223,9 @@ class Settings:
     # ======== NLP CONFIG (optional DeBERTa ONNX) ========
     # If provided, we enable zero-shot intent + entity scoring via ONNXRuntime.
     nlp_model_path: str | None = os.getenv("NLP_MODEL_PATH") or os.getenv("DEBERTA_ONNX_PATH")
+    # Optional dynamic-int8 export of the same model; preferred over nlp_model_path when it exists
+    nlp_model_int8_path: str | None = os.getenv("NLP_MODEL_INT8_PATH") or None
+    nlp_intra_op_threads: int = int(os.getenv("NLP_INTRA_OP_THREADS", "1"))
     nlp_tokenizer_path: str | None = os.getenv("NLP_TOKENIZER_PATH") or os.getenv("DEBERTA_TOKENIZER_JSON")
     nlp_conf_high: float = float(os.getenv("NLP_CONF_HIGH", "0.88"))
     nlp_conf_mid: float = float(os.getenv("NLP_CONF_MID", "0.75"))
@@ -226,6 +239,8 @@ class Settings:
     trusted_role_names: list[str] = field(default_factory=lambda: [
         "due paying members", "Server Booster"
     ])
+    # Lowercased trusted_role_names, filled in after load (see below)
+    trusted_role_set: frozenset[str] = frozenset()
     # Minimum account age in days to skip spam checks
     spam_min_account_days: int = int(os.getenv("SPAM_MIN_ACCOUNT_DAYS", "30"))
     # NLP spam threshold if ONNX model is configured
@@ -293,3 +308,9 @@ if not settings.sheet_catabase_id and settings.cat_spreadsheet_id:
     settings.sheet_catabase_id = settings.cat_spreadsheet_id
 if not settings.sheet_vision_id and settings.aux_spreadsheet_id:
     settings.sheet_vision_id = settings.aux_spreadsheet_id
+
+# Lowercase trusted role names once instead of per spam check
+settings.trusted_role_set = frozenset(str(s).lower() for s in (settings.trusted_role_names or []))
+
+# Admin IDs are fixed at startup; a frozenset gives O(1) membership for per-message checks
+ADMIN_IDS: frozenset[int] = frozenset(int(x) for x in (settings.admin_ids or []))
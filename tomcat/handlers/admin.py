@@ -1,12 +1,12 @@
 from __future__ import annotations
 import discord
 from typing import Dict, Any
-from ..config import settings
+from ..config import settings, ADMIN_IDS
 from ..logger import log_action
 
 async def handle_silent_mode(args: Dict[str, Any], ctx: Dict[str, Any]) -> None:
     author = ctx["author"]
-    if int(author.id) not in settings.admin_ids:
+    if author.id not in ADMIN_IDS:
         log_action("silent_mode_denied", f"user={author.id}", "unauthorized")
         return
 
@@ -11,6 +11,7 @@ from typing import Any, Dict, Optional
 
 from ..logger import log_event, log_action
 from ..config import settings
+from ..runtime import run_blocking
 
 try:
     from ..utils.sender import safe_send  # (channel, content, **kwargs)
@@ -140,9 +141,7 @@ async def handle_check_last_email(intent, ctx) -> None:
             lambda: svc.users().messages().get(userId="me", id=mid, format="metadata", metadataHeaders=["Subject", "From"]).execute()
         )
         payload = msg.get("payload", {}) if isinstance(msg, dict) else {}
-        headers = {h.get("name", ""): h.get("value", "") for h in (payload.get("headers", []) or [])}
-        subject = headers.get("Subject", "(no subject)")
-        from_hdr = headers.get("From", "(unknown sender)")
+        subject, from_hdr = _subject_and_from(payload)
         snippet = msg.get("snippet", "") if isinstance(msg, dict) else ""
         await safe_send(ch, f"Last email:\nSubject: {subject}\nFrom: {from_hdr}")
         log_event({
@@ -216,8 +215,20 @@ async def handle_gmail_auth_code(intent, ctx) -> None:
 # ---- Email logging (periodic + manual) --------------------------------------
 
 import base64
+import re
+from html import unescape as _html_unescape
 from typing import List, Dict
 from bs4 import BeautifulSoup  # type: ignore
+try:
+    import lxml  # type: ignore  # noqa: F401  (optional; C parser is far faster than html.parser)
+    _HTML_PARSER = "lxml"
+except Exception:
+    _HTML_PARSER = "html.parser"
+
+# Bodies with only a handful of tags (most Venmo/Cash App notifications) are stripped
+# with a regex; building a soup for those costs more than the rest of the row.
+_TAG_RE = re.compile(r"<[^>]+>")
+_HTML_MIN_TAGS = 5
 
 EMAILS_DIR = "logs/emails"
 INDEX_FILE = f"{EMAILS_DIR}/index.jsonl"
@@ -229,7 +240,13 @@ def _ensure_email_dirs():
     except Exception:
         pass
 
+# Index of logged message ids, read from disk once and kept in step by _append_index
+_logged_ids: Optional[set[str]] = None
+
 def _load_logged_ids() -> set[str]:
+    global _logged_ids
+    if _logged_ids is not None:
+        return _logged_ids
     _ensure_email_dirs()
     ids: set[str] = set()
     try:
@@ -247,20 +264,22 @@ def _load_logged_ids() -> set[str]:
                     except Exception:
                         continue
     except Exception:
-        pass
+        return ids  # don't cache a partial read; retry next call
+    _logged_ids = ids
     return ids
 
-def _append_index(mid: str, seen: set[str] | None = None):
+def _append_index(mids: List[str]):
+    """Append ids to the index in one write, skipping any already recorded."""
     _ensure_email_dirs()
     try:
-        # avoid duplicates in index file
-        if seen is None:
-            # light-weight read to skip duplicate writes
-            existing = _load_logged_ids()
-            if mid in existing:
-                return
+        existing = _load_logged_ids()
+        fresh = [m for m in dict.fromkeys(mids) if m and m not in existing]
+        if not fresh:
+            return
+        now = _now_iso()
         with open(INDEX_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps({"id": mid, "logged_at": _now_iso()}) + "\n")
+            f.write("".join(json.dumps({"id": m, "logged_at": now}) + "\n" for m in fresh))
+        existing.update(fresh)
     except Exception:
         pass
 
@@ -272,6 +291,23 @@ def _decode_part(data: str) -> str:
     except Exception:
         return ""
 
+def _subject_and_from(payload: Dict[str, Any]) -> tuple[str, str]:
+    """Subject and From headers in one pass; stops once both are seen (full
+    messages carry 20-40 headers and only these two are logged)."""
+    subject = from_hdr = None
+    for h in (payload.get("headers", []) or []):
+        name = h.get("name", "")
+        if name == "Subject" and subject is None:
+            subject = h.get("value", "")
+        elif name == "From" and from_hdr is None:
+            from_hdr = h.get("value", "")
+        else:
+            continue
+        if subject is not None and from_hdr is not None:
+            break
+    return (subject if subject is not None else "(no subject)",
+            from_hdr if from_hdr is not None else "(unknown sender)")
+
 def _extract_text_content(msg: Dict[str, Any]) -> str:
     # Prefer text/plain; fallback to text/html stripped; else snippet
     payload = msg.get("payload") or {}
@@ -302,11 +338,14 @@ def _extract_text_content(msg: Dict[str, Any]) -> str:
         if mime.startswith("text/html") and not html:
             html = _decode_part(data)
     if not text and html:
-        try:
-            soup = BeautifulSoup(html, "html.parser")
-            text = soup.get_text(separator="\n")
-        except Exception:
-            text = html
+        if html.count("<") >= _HTML_MIN_TAGS and "</" in html:
+            try:
+                soup = BeautifulSoup(html, _HTML_PARSER)
+                text = soup.get_text(separator="\n")
+            except Exception:
+                text = html
+        else:
+            text = _html_unescape(_TAG_RE.sub("\n", html))
     if not text:
         text = msg.get("snippet", "")
     return text or ""
@@ -316,9 +355,8 @@ _MONTH_NAMES = {
     7: "Jul", 8: "Aug", 9: "Sept", 10: "Oct", 11: "Nov", 12: "Dec",
 }
 
-async def _write_email_log_row(obj: Dict[str, Any]):
-    _ensure_email_dirs()
-    # Write into monthly NDJSON: e.g., 2025-Sept.ndjson
+def _email_log_path(obj: Dict[str, Any]) -> str:
+    # Monthly NDJSON: e.g., 2025-Sept.ndjson
     ts = obj.get("ts_received") or obj.get("ts_logged") or _now_iso()
     try:
         # Parse to get year and month; handle Z timezone suffix
@@ -327,87 +365,141 @@ async def _write_email_log_row(obj: Dict[str, Any]):
     except Exception:
         dt = datetime.now()
     mon_name = _MONTH_NAMES.get(dt.month, f"{dt.month:02d}")
-    path = os.path.join(EMAILS_DIR, f"{dt.year}-{mon_name}.ndjson")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    return os.path.join(EMAILS_DIR, f"{dt.year}-{mon_name}.ndjson")
+
+async def _write_email_log_rows(rows: List[Dict[str, Any]]):
+    """Append rows grouped by monthly file: one open+write per file for the whole batch."""
+    _ensure_email_dirs()
+    by_path: Dict[str, List[str]] = {}
+    for obj in rows:
+        by_path.setdefault(_email_log_path(obj), []).append(json.dumps(obj, ensure_ascii=False) + "\n")
+    for path, lines in by_path.items():
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+# Gmail recommends <= 50 calls per batch request to stay clear of per-user rate limits
+_GMAIL_BATCH_MAX = 50
+
+def _get_full_messages(svc, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch format=full messages for ids in one multipart batch request (blocking).
+    Ids whose sub-request failed are left out; they stay unindexed and get retried next run.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    def _cb(request_id, response, exception):
+        if exception is None and isinstance(response, dict):
+            out[request_id] = response
+    batch = svc.new_batch_http_request(callback=_cb)
+    for mid in ids:
+        batch.add(svc.users().messages().get(userId="me", id=mid, format="full"), request_id=mid)
+    batch.execute()
+    return out
+
+def _email_rows(ids: List[str], fulls: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build email_received log rows for the fetched messages, in ids order."""
+    rows: List[Dict[str, Any]] = []
+    for mid in ids:
+        full = fulls.get(mid)
+        if full is None:
+            continue
+        payload = full.get("payload", {})
+        subject, from_hdr = _subject_and_from(payload)
+        idate = str(full.get("internalDate") or "")
+        internal_date_ms = int(idate) if idate.isdigit() else 0
+        ts_received = datetime.utcfromtimestamp(internal_date_ms/1000).isoformat() + "Z" if internal_date_ms else None
+        content = _extract_text_content(full)
+        rows.append({
+            "event": "email_received",
+            "id": mid,
+            "subject": subject,
+            "from": from_hdr,
+            "ts_received": ts_received,
+            "ts_logged": _now_iso(),
+            "content": content,
+        })
+    return rows
 
 async def _log_emails_batch(svc, messages: List[Dict[str, Any]], delay_sec: float = 10.0) -> int:
     """Fetch full messages and append to logs/emails/*.ndjson for any not yet logged.
-    Returns count logged.
+    Returns count logged. Callers hold _EMAIL_LOG_LOCK (asyncio.Lock is not re-entrant).
     """
-    async with _EMAIL_LOG_LOCK:
-        # Build a working set of already logged IDs and de-duplicate input
-        logged = _load_logged_ids()
-        seen: set[str] = set(logged)
-        uniq: List[Dict[str, Any]] = []
-        for m in messages:
-            mid = str(m.get("id"))
-            if not mid:
-                continue
-            if mid in {str(x.get("id")) for x in uniq}:
-                continue
-            uniq.append(m)
-
-        count = 0
-        total = len(uniq)
-        for m in uniq:
-            mid = str(m.get("id"))
-            if not mid or mid in seen:
-                continue
-            full = await asyncio.to_thread(lambda: svc.users().messages().get(userId="me", id=mid, format="full").execute())
-            payload = full.get("payload", {})
-            headers = {h.get("name", ""): h.get("value", "") for h in (payload.get("headers", []) or [])}
-            subject = headers.get("Subject", "(no subject)")
-            from_hdr = headers.get("From", "(unknown sender)")
-            internal_date_ms = int(full.get("internalDate", 0)) if str(full.get("internalDate", "")).isdigit() else 0
-            ts_received = datetime.utcfromtimestamp(internal_date_ms/1000).isoformat() + "Z" if internal_date_ms else None
-            content = _extract_text_content(full)
-            row = {
-                "event": "email_received",
-                "id": mid,
-                "subject": subject,
-                "from": from_hdr,
-                "ts_received": ts_received,
-                "ts_logged": _now_iso(),
-                "content": content,
-            }
-            await _write_email_log_row(row)
-            _append_index(mid, seen)
-            seen.add(mid)
-            count += 1
-            if delay_sec and count < total:
-                await asyncio.sleep(delay_sec)
-        return count
+    # De-duplicate input (order kept) and drop anything already logged
+    logged = _load_logged_ids()
+    ids = [mid for mid in dict.fromkeys(str(m.get("id") or "") for m in messages) if mid and mid not in logged]
+
+    rows: List[Dict[str, Any]] = []
+    for start in range(0, len(ids), _GMAIL_BATCH_MAX):
+        chunk = ids[start:start + _GMAIL_BATCH_MAX]
+        fulls = await run_blocking(_get_full_messages, svc, chunk)
+        # Body decoding + HTML stripping is CPU work; keep it off the event loop too
+        rows.extend(await run_blocking(_email_rows, chunk, fulls))
+        # Pace successive batches the way single fetches used to be paced
+        if delay_sec and start + _GMAIL_BATCH_MAX < len(ids):
+            await asyncio.sleep(delay_sec)
+    if rows:
+        # Rows land before their ids hit the index, so a failed write gets retried next run
+        await _write_email_log_rows(rows)
+        _append_index([r["id"] for r in rows])
+    return len(rows)
+
+_GMAIL_LOG_INTERVAL_SEC = 4 * 60 * 60
+# After a failed run retry sooner, doubling per consecutive failure up to the normal interval
+_GMAIL_RETRY_BASE_SEC = 5 * 60
+_gmail_failures = 0
+_gmail_timer: Optional[asyncio.TimerHandle] = None
+_gmail_tick_task: Optional[asyncio.Task] = None
+
+def _arm_gmail_logging(bot, delay: float = _GMAIL_LOG_INTERVAL_SEC) -> None:
+    """Schedule the next tick with a one-shot timer (no coroutine parked in sleep)."""
+    global _gmail_timer
+    _gmail_timer = asyncio.get_running_loop().call_later(delay, _fire_gmail_tick, bot)
+
+def _fire_gmail_tick(bot) -> None:
+    global _gmail_tick_task
+    _gmail_tick_task = asyncio.create_task(_gmail_log_tick(bot))
+
+async def _gmail_log_tick(bot) -> None:
+    global _gmail_failures
+    failed = False
+    try:
+        async with _EMAIL_LOG_LOCK:
+            # Prefer logging channel for auth prompts if needed
+            ch = None
+            try:
+                from ..config import settings as _settings
+                ch_id = getattr(_settings, "ch_logging", None)
+                if ch_id:
+                    ch = bot.get_channel(int(ch_id))
+            except Exception:
+                ch = None
+            svc = await _build_gmail_service(ch or getattr(bot, "user", None))
+            # 4h window; exclude sent mail
+            q = "in:inbox -from:me newer_than:4h"
+            res = await run_blocking(lambda: svc.users().messages().list(userId="me", q=q, maxResults=100, includeSpamTrash=False).execute())
+            msgs = res.get("messages", []) if isinstance(res, dict) else []
+            if msgs:
+                n = await _log_emails_batch(svc, msgs, delay_sec=10.0)
+                log_action("gmail_log_scheduler", f"found={len(msgs)}", f"logged={n}")
+    except RuntimeError:
+        # likely gmail_auth_pending; do nothing until authorized
+        log_action("gmail_log_scheduler", "auth", "pending")
+    except Exception as e:
+        failed = True
+        log_action("gmail_log_scheduler_error", f"failures={_gmail_failures + 1}", str(e))
+    finally:
+        if failed:
+            _gmail_failures += 1
+            delay = min(_GMAIL_RETRY_BASE_SEC * (2 ** (_gmail_failures - 1)), _GMAIL_LOG_INTERVAL_SEC)
+        else:
+            _gmail_failures = 0
+            delay = _GMAIL_LOG_INTERVAL_SEC
+        # Re-arm: ~4 hours after a good run, sooner (backing off) after an error
+        _arm_gmail_logging(bot, delay)
 
 async def start_gmail_logging_scheduler(bot) -> None:
-    """Every ~4 hours, log any newly received emails in the last 4 hours."""
-    while True:
-        try:
-            async with _EMAIL_LOG_LOCK:
-                # Prefer logging channel for auth prompts if needed
-                ch = None
-                try:
-                    from ..config import settings as _settings
-                    ch_id = getattr(_settings, "ch_logging", None)
-                    if ch_id:
-                        ch = bot.get_channel(int(ch_id))
-                except Exception:
-                    ch = None
-                svc = await _build_gmail_service(ch or getattr(bot, "user", None))
-                # 4h window; exclude sent mail
-                q = "in:inbox -from:me newer_than:4h"
-                res = await asyncio.to_thread(lambda: svc.users().messages().list(userId="me", q=q, maxResults=100, includeSpamTrash=False).execute())
-                msgs = res.get("messages", []) if isinstance(res, dict) else []
-                if msgs:
-                    n = await _log_emails_batch(svc, msgs, delay_sec=10.0)
-                    log_action("gmail_log_scheduler", f"found={len(msgs)}", f"logged={n}")
-        except RuntimeError:
-            # likely gmail_auth_pending; do nothing until authorized
-            log_action("gmail_log_scheduler", "auth", "pending")
-        except Exception as e:
-            log_action("gmail_log_scheduler_error", "", str(e))
-        # Sleep ~4 hours
-        await asyncio.sleep(4 * 60 * 60)
+    """Log newly received emails now, then every ~4 hours via a re-armed timer."""
+    if _gmail_timer is not None:
+        return  # already armed (e.g., on_ready after a reconnect)
+    await _gmail_log_tick(bot)
 
 async def handle_log_recent_emails(intent, ctx) -> None:
     """Manual: TomCat, log the past N emails (received)."""
@@ -417,7 +509,7 @@ async def handle_log_recent_emails(intent, ctx) -> None:
         async with _EMAIL_LOG_LOCK:
             svc = await _build_gmail_service(ch)
             q = os.getenv("GMAIL_LAST_QUERY", "in:inbox -from:me")
-            res = await asyncio.to_thread(lambda: svc.users().messages().list(userId="me", q=q, maxResults=n, includeSpamTrash=False).execute())
+            res = await run_blocking(lambda: svc.users().messages().list(userId="me", q=q, maxResults=n, includeSpamTrash=False).execute())
             msgs = res.get("messages", []) if isinstance(res, dict) else []
             if not msgs:
                 await safe_send(ch, "No emails found to log.")
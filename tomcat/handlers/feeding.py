@@ -10,9 +10,10 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import discord
 
-from ..config import settings
+from ..config import settings, ADMIN_IDS
 from ..logger import log_action
 from ..services.sheets_client import sheets_client
+from ..runtime import run_blocking
 from ..aliases import resolve_station_or_cat
 from ..utils.sender import safe_send
 
@@ -85,13 +86,25 @@ def _rewrite_jsonl(path: str, rows: List[dict]) -> None:
             f.write(json.dumps(r) + "\n")
 
 # ------------- helpers: schedule/users ----------
+# Normalized {name: user_id} built from settings.user_id_map, rebuilt only if that
+# mapping object is replaced. Schedule reads resolve one name per station.
+_roster: Optional[tuple[Any, Dict[str, int]]] = None
+
+def _roster_index() -> Dict[str, int]:
+    global _roster
+    cfg_map = getattr(settings, "user_id_map", {}) or {}
+    if _roster is not None and _roster[0] is cfg_map:
+        return _roster[1]
+    # normalize keys to simple form
+    norm_map = {str(k).strip(): int(v) for k, v in cfg_map.items() if str(v).isdigit() or isinstance(v, int)}
+    _roster = (cfg_map, norm_map)
+    return norm_map
+
 def _resolve_user_ids(names: List[str]) -> List[int]:
     """Resolve a list of display names to Discord user IDs via settings.user_id_map.
     Accepts either names or numeric strings.
     """
-    cfg_map = getattr(settings, "user_id_map", {}) or {}
-    # normalize keys to simple form
-    norm_map = {str(k).strip(): int(v) for k, v in cfg_map.items() if str(v).isdigit() or isinstance(v, int)}
+    norm_map = _roster_index()
     ids: List[int] = []
     for n in names:
         n1 = str(n).strip()
@@ -196,10 +209,7 @@ def _find_date_row(ws, date_iso: str) -> Optional[int]:
             return idx
     return None
 
-async def _mark_checkbox_in_sheet(station: str, date_iso: str) -> bool:
-    """Mark the (station, date) cell TRUE in the FeedingStationChecklist tab.
-    Header row (1) has stations; first column (A) has dates; body is checkboxes.
-    """
+def _mark_checkbox_sync(station: str, date_iso: str) -> bool:
     ws = _open_feeding_ws()
     if ws is None:
         return False
@@ -223,10 +233,14 @@ async def _mark_checkbox_in_sheet(station: str, date_iso: str) -> bool:
         log_action("sheet_mark_error", f"station={station} date={date_iso}", str(e))
         return False
 
-async def _list_unfed_stations_today() -> List[str]:
-    """Return station display names that are NOT checked for today's date.
-    Station names come from header row; today row comes from Column A.
+async def _mark_checkbox_in_sheet(station: str, date_iso: str) -> bool:
+    """Mark the (station, date) cell TRUE in the FeedingStationChecklist tab.
+    Header row (1) has stations; first column (A) has dates; body is checkboxes.
     """
+    # gspread is synchronous; keep its round-trips off the event loop
+    return await run_blocking(_mark_checkbox_sync, station, date_iso)
+
+def _unfed_stations_sync() -> List[str]:
     ws = _open_feeding_ws()
     if ws is None:
         return []
@@ -257,6 +271,12 @@ async def _list_unfed_stations_today() -> List[str]:
         log_action("unfed_list_error", "read", str(e))
         return []
 
+async def _list_unfed_stations_today() -> List[str]:
+    """Return station display names that are NOT checked for today's date.
+    Station names come from header row; today row comes from Column A.
+    """
+    return await run_blocking(_unfed_stations_sync)
+
 async def handle_feeding_inquiry(intent, ctx: Dict[str, Any]) -> None:
     ch = ctx["channel"]
     # Get today’s stations from your schedule (fallback to keys union if needed)
@@ -364,17 +384,15 @@ async def _accept_latest_open_sub_in_channel(channel_id: int, assignee_id: int)
 
 # ------------- scheduler: 8:00 pm ping ----------
 async def start_feeding_scheduler(bot: discord.Client) -> None:
-    async def _runner():
-        while True:
-            try:
-                # sleep until next 20:00 America/Chicago
-                await _sleep_until_local_time(20, 0)
-                await _run_8pm_check(bot)
-            except Exception as e:
-                log_action("feeding_scheduler_error", "loop", str(e))
-                await asyncio.sleep(10)
-
-    asyncio.create_task(_runner())
+    # Runs forever; the caller owns the task (see main._spawn)
+    while True:
+        try:
+            # sleep until next 20:00 America/Chicago
+            await _sleep_until_local_time(20, 0)
+            await _run_8pm_check(bot)
+        except Exception as e:
+            log_action("feeding_scheduler_error", "loop", str(e))
+            await asyncio.sleep(10)
 
 async def _sleep_until_local_time(hour: int, minute: int):
     now = datetime.now(CENTRAL_TZ) if CENTRAL_TZ else datetime.now()
@@ -465,7 +483,7 @@ async def handle_manual_8pm_preview(intent, ctx: Dict[str, Any]) -> None:
     """Admin-only: post a dry-run of the 8pm message to the current channel (no pings)."""
     author = ctx["author"]
     uid = int(getattr(author, 'id', 0))
-    if uid not in (getattr(settings, 'admin_ids', []) or []):
+    if uid not in ADMIN_IDS:
         log_action("manual_8pm_denied", f"user={uid}", "not_admin")
         return
     bot = ctx.get("bot")
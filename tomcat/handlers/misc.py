@@ -5,8 +5,9 @@ import asyncio
 from typing import Any, Dict, cast
 from ..logger import log_action
 from ..config import settings
-from ..services.catsheets import build_profile_embed
+from ..services.catsheets import build_profile_embed, refresh as refresh_catsheets
 from ..services.sheets_client import sheets_client
+from ..runtime import run_blocking
 import datetime as dt
 from discord.abc import Messageable
 
@@ -107,8 +108,7 @@ async def handle_profiles_create(intent, ctx):
             except Exception:
                 pass
             return
-        ws = gc.open_by_key(sheet_id).worksheet("CatDatabase")
-        rows = ws.get_all_values()
+        rows = await run_blocking(lambda: gc.open_by_key(sheet_id).worksheet("CatDatabase").get_all_values())
     except Exception as e:
         log_action("profiles_error", "sheet_read", str(e))
         try:
@@ -195,8 +195,7 @@ async def handle_profile_update_one(intent, ctx):
             except Exception:
                 pass
             return
-        ws = gc.open_by_key(sheet_id).worksheet("CatDatabase")
-        rows = ws.get_all_values()
+        rows = await run_blocking(lambda: gc.open_by_key(sheet_id).worksheet("CatDatabase").get_all_values())
         _, *data = rows if rows else ([], [])
         r = next((r for r in data if len(r) > 1 and r[1] == cat_id), None)
         if not r:
@@ -229,6 +228,9 @@ async def handle_profiles_update_all(intent, ctx):
     except Exception:
         pass
 
+    # Bulk refresh should reflect the sheet as it is now, not the 5-minute cache
+    refresh_catsheets()
+
     # Preload CatDatabase for speed
     try:
         gc = sheets_client()
@@ -236,8 +238,7 @@ async def handle_profiles_update_all(intent, ctx):
         if not sheet_id:
             log_action("profiles_error", "missing_catabase_id", "")
             return
-        ws = gc.open_by_key(sheet_id).worksheet("CatDatabase")
-        rows = ws.get_all_values()
+        rows = await run_blocking(lambda: gc.open_by_key(sheet_id).worksheet("CatDatabase").get_all_values())
         _, *data = rows if rows else ([], [])
         by_id = {r[1]: r for r in data if len(r) > 1}
     except Exception as e:
@@ -297,7 +298,7 @@ async def handle_channel_image_intake(message: discord.Message) -> None:
         return
 
     try:
-        ws = _open_ws(tab)
+        ws = await run_blocking(_open_ws, tab)
         if ws is None:
             log_action("image_intake_error", f"channel={ch_id}", "no_worksheet")
             return
@@ -309,7 +310,7 @@ async def handle_channel_image_intake(message: discord.Message) -> None:
             username,
             tsz,
         ] for att in images]
-        ws.append_rows(rows, value_input_option=cast(Any,"USER_ENTERED"))
+        await run_blocking(ws.append_rows, rows, value_input_option=cast(Any,"USER_ENTERED"))
         log_action("image_intake", f"channel={ch_id}", f"rows={len(rows)}")
     except Exception as e:
         log_action("image_intake_error", f"channel={ch_id}", str(e))
@@ -7,8 +7,10 @@ import re
 import os
 from collections import deque, defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, date
-from typing import Any, Deque, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Tuple
 #easter egg. hi
 '''to-do:
     cache "show me" pics. Instead of it taking like >5 seconds per pic, we just grab a random pic
@@ -19,7 +21,7 @@ from typing import Any, Deque, Dict, List, Optional, Tuple
 import discord
 
 # ---- config / logging --------------------------------------------------------
-from .config import settings
+from .config import settings, ADMIN_IDS
 from .logger import log_action, log_intent
 try:
     # Use the common safe sender that respects silent mode
@@ -61,6 +63,11 @@ except Exception:
     _BOT_ID_INT = 0
 BOT_MENTION_RE = re.compile(rf"<@!?{_BOT_ID_INT}>") if _BOT_ID_INT else None
 
+
+def _is_admin(author: Any) -> bool:
+    """Configured admin (ADMIN_IDS) or guild administrator."""
+    return getattr(author, "id", 0) in ADMIN_IDS or getattr(getattr(author, "guild_permissions", None), "administrator", False)
+
 # ==============================================================================
 # Intent event and router
 # ==============================================================================
@@ -129,12 +136,31 @@ CREATE_PROFILES_RE = re.compile(r"^create\s+profiles?\s+(\d+)(?:\s+through\s+(\d
 UPDATE_PROFILE_RE  = re.compile(r"^update\s+profile\s+(\d+)$", re.I)
 UPDATE_ALL_PROFILES_RE = re.compile(r"^update\s+all\s+profiles$", re.I)
 
+# Union of every addressed-command pattern above. One scan tells us whether the
+# per-command chain in _analyze_with_context can match at all; plain chatter
+# aimed at TomCat skips straight to the feeding flows.
+_ADDRESSED_CMD_ANY = re.compile("|".join(f"(?:{rx.pattern})" for rx in (
+    SILENT_CMD, CHECK_LAST_EMAIL_RE, LOG_PAST_EMAILS_RE, AUTH_CODE_RE, WHO_THIS_RE,
+    FEEDING_UPDATE_RE, MANUAL_8PM_RE, CREATE_PROFILES_RE, UPDATE_PROFILE_RE,
+    UPDATE_ALL_PROFILES_RE, FEEDING_CHECK_RE, SHOW_PAT, WHO_PAT, IDENT_PAT,
+    DETECT_PAT, CROP_PAT,
+)), re.I)
+
 
 
 
 # quick weekday map
 WEEKDAYS = {w.lower(): i for i, w in enumerate(["Mon","Tue","Wed","Thu","Fri","Sat","Sun"])}
 
+# date / token helpers, compiled once instead of per message
+_WD_ALT = r"mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun|sunday|monday|tuesday|wednesday|thursday|friday|saturday"
+ON_WEEKDAY_RE = re.compile(rf"\bon\s+({_WD_ALT})\b")
+WEEKDAY_RE = re.compile(rf"\b(this|next)?\s*({_WD_ALT})\b")
+DAY_RANGE_RE = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s*(?:to|-)\s*(\d{1,2})(?:st|nd|rd|th)?\b")
+_WS_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_BOT_MENTION_STRIP_RE = re.compile(rf"\s*<@!?{_BOT_ID_INT}>\s*[:,\-]*\s*") if _BOT_ID_INT else None
+
 # Tight fuzzy thresholds
 FUZZY_ACCEPT = 88
 FUZZY_LEN_BIAS = 82
@@ -163,6 +189,17 @@ except Exception:
         # difflib ratio ~ [0,1]
         return (name[0], difflib.SequenceMatcher(None, q, name[0]).ratio())
 
+# Display-name vocab matchers, built once per kind. The union pass rejects the common
+# "no name mentioned" message in one scan instead of one regex per vocab entry.
+@lru_cache(maxsize=4)
+def _vocab_matchers(want: str) -> Tuple[Optional[re.Pattern], Tuple[Tuple[str, re.Pattern], ...]]:
+    names = alias_vocab().get(f"{want}s", [])
+    per_name = tuple((nm, re.compile(rf"\b{re.escape(nm.lower())}\b")) for nm in names)
+    if not per_name:
+        return (None, ())
+    alts = "|".join(re.escape(nm.lower()) for nm in sorted(names, key=len, reverse=True))
+    return (re.compile(rf"\b(?:{alts})\b"), per_name)
+
 # ------------------------------------------------------------------------------
 # Clarification UI: Yes/No that only the original author can click
 # ------------------------------------------------------------------------------
@@ -199,6 +236,13 @@ class ClarifyView(discord.ui.View):
             pass
         self.stop()
 
+# Pending CV follow-ups store the intent name; resolve it to the vision handler in one lookup
+_PENDING_CV_HANDLERS: Mapping[str, Callable[..., Awaitable[None]]] = MappingProxyType({
+    "cv_identify": handle_cv_identify,
+    "cv_detect": handle_cv_detect,
+    "cv_crop": handle_cv_crop,
+})
+
 # ------------------------------------------------------------------------------
 # IntentRouter
 # ------------------------------------------------------------------------------
@@ -217,6 +261,26 @@ class IntentRouter:
         self._pending_feed: Dict[Tuple[int,int], Dict[str, Any]] = {}
         # decision traces for logging: message_id -> [steps]
         self._traces: Dict[int, List[str]] = {}
+        # event.type -> bound handler; read-only once built so nothing re-registers at runtime
+        self._handlers: Mapping[str, Callable[[IntentEvent, discord.Message, Dict[str, Any]], Awaitable[None]]] = MappingProxyType({
+            "show_photo": self._on_show_photo,
+            "who_is": self._on_who_is,
+            "cv_identify": self._on_cv_identify,
+            "cv_detect": self._on_cv_detect,
+            "cv_crop": self._on_cv_crop,
+            "sub_request": self._on_sub_request,
+            "sub_accept": self._on_sub_accept,
+            "feed_update": self._on_feed_update,
+            "feeding_status": self._on_feeding_status,
+            "gmail_check_last": self._on_gmail_check_last,
+            "gmail_auth_code": self._on_gmail_auth_code,
+            "gmail_log_recent": self._on_gmail_log_recent,
+            "profiles_create": self._on_profiles_create,
+            "profile_update_one": self._on_profile_update_one,
+            "profiles_update_all": self._on_profiles_update_all,
+            "silent_mode": self._on_silent_mode,
+            "manual_8pm": self._on_manual_8pm,
+        })
 
     # ---------- public entry ----------
     async def handle_message(self, message: Any, ctx: Dict[str, Any]) -> None:
@@ -238,13 +302,10 @@ class IntentRouter:
                     now = datetime.now(CENTRAL_TZ) if CENTRAL_TZ else datetime.now()
                     if not expires or now <= expires:
                         itype = pend.get("intent", "cv_identify")
+                        if itype not in _PENDING_CV_HANDLERS:
+                            itype = "cv_identify"
                         # Dispatch straight to the vision handler
-                        if itype == "cv_crop":
-                            await handle_cv_crop(_intent("cv_crop", {}), ctx)
-                        elif itype == "cv_detect":
-                            await handle_cv_detect(_intent("cv_detect", {}), ctx)
-                        else:
-                            await handle_cv_identify(_intent("cv_identify", {}), ctx)
+                        await _PENDING_CV_HANDLERS[itype](_intent(itype, {}), ctx)
                         log_action("cv_pending_fulfilled", f"ch={message.channel.id}; user={message.author.id}", itype)
                         self._pending_cv.pop(key, None)
                         return
@@ -358,9 +419,9 @@ class IntentRouter:
             trace.append("wake:mention")
 
         # 1) TomCat commands first (show / who / identify) when addressed
-        if addressed:
-            # strip wake tokens
-            text_wo = self._strip_wake_tokens(text, message)
+        # strip wake tokens
+        text_wo = self._strip_wake_tokens(text, message) if addressed else text
+        if addressed and _ADDRESSED_CMD_ANY.search(text_wo):
             # Silent mode command: requires TomCat prefix
             m = SILENT_CMD.search(text_wo)
             if m:
@@ -373,7 +434,7 @@ class IntentRouter:
             # Admin-only: "check the last email"
             if CHECK_LAST_EMAIL_RE.search(text_wo):
                 author = message.author
-                is_admin = int(getattr(author,'id',0)) in (getattr(settings,'admin_ids',[]) or []) or getattr(getattr(author, 'guild_permissions', None), 'administrator', False)
+                is_admin = _is_admin(author)
                 if not is_admin:
                     self._traces[row["message_id"]] = trace + ["deny:not_admin"]
                     return IntentEvent(type="none", confidence=0.0, channel_id=row["channel_id"], user_id=row["user_id"], message_id=row["message_id"], text=row["text"], has_image=has_image, attachment_ids=row["attachment_ids"])
@@ -387,7 +448,7 @@ class IntentRouter:
             m_log = LOG_PAST_EMAILS_RE.search(text_wo)
             if m_log:
                 author = message.author
-                is_admin = int(getattr(author,'id',0)) in (getattr(settings,'admin_ids',[]) or []) or getattr(getattr(author, 'guild_permissions', None), 'administrator', False)
+                is_admin = _is_admin(author)
                 if not is_admin:
                     self._traces[row["message_id"]] = trace + ["deny:not_admin"]
                     return IntentEvent(type="none", confidence=0.0, channel_id=row["channel_id"], user_id=row["user_id"], message_id=row["message_id"], text=row["text"], has_image=has_image, attachment_ids=row["attachment_ids"])
@@ -400,7 +461,7 @@ class IntentRouter:
             m_auth = AUTH_CODE_RE.search(text_wo)
             if m_auth:
                 author = message.author
-                is_admin = int(getattr(author,'id',0)) in (getattr(settings,'admin_ids',[]) or []) or getattr(getattr(author, 'guild_permissions', None), 'administrator', False)
+                is_admin = _is_admin(author)
                 if not is_admin:
                     self._traces[row["message_id"]] = trace + ["deny:not_admin"]
                     return IntentEvent(type="none", confidence=0.0, channel_id=row["channel_id"], user_id=row["user_id"], message_id=row["message_id"], text=row["text"], has_image=has_image, attachment_ids=row["attachment_ids"])
@@ -697,9 +758,10 @@ class IntentRouter:
                 self._traces[row["message_id"]] = trace
                 return ev
 
-        # Case B: only station name(s), use image context if needed
-        station_only_list = self._extract_all_entities(text, want="station")
-        if not station_only_list:
+        # Case B: only station name(s), use image context if needed (feeding channels only,
+        # so skip the fuzzy station scan everywhere else)
+        station_only_list = self._extract_all_entities(text, want="station") if in_feeding else []
+        if in_feeding and not station_only_list:
             best = self._extract_best_entity(text, want="station")
             if best:
                 station_only_list = [best]
@@ -802,141 +864,128 @@ class IntentRouter:
 
     # ---------- dispatch ----------
     async def _dispatch(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
-        # Confidence gates and clarification
+        fn = self._handlers.get(event.type)
+        if fn is None:
+            log_action("dispatch_missing", f"type={event.type}", "")
+            return
+        await fn(event, message, ctx)
 
-        # Commands
-        if event.type == "show_photo" and event.cat_name:
+    # Commands
+    async def _on_show_photo(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        if event.cat_name:
             # reuse your cats handler
             await handle_cat_photo(_intent("cat_photo", {"name": event.cat_name}), ctx)
-            return
 
-        if event.type == "who_is" and event.cat_name:
+    async def _on_who_is(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        if event.cat_name:
             await handle_cat_show(_intent("cat_show", {"name": event.cat_name}), ctx)
-            return
-
-        if event.type == "cv_identify":
-            # If event.attachment_ids came from context pairing, we’ll “replay” the other message by forging message.attachments.
-            # Easiest path: just call the existing handler; it already checks current or referenced message.
-            # If this came via a reply, suppress the handler's "attach an image" prompt when empty
-            via_reply = bool(getattr(message, "reference", None))
-            await handle_cv_identify(_intent("cv_identify", {}), {**ctx, "message": message, "silent_on_no_image": via_reply})
-            return
-
-        if event.type == "sub_request":
-            if getattr(event, 'stations', None) and len(event.stations) > 1:
-                for st in event.stations:
-                    e2 = IntentEvent(
-                        type="sub_request", confidence=event.confidence,
-                        channel_id=event.channel_id, user_id=event.user_id, message_id=event.message_id,
-                        text=event.text, has_image=event.has_image, attachment_ids=event.attachment_ids,
-                        station=st, dates=event.dates
-                    )
-                    await feeding.handle_sub_request_event(e2, ctx)
-            else:
-                await feeding.handle_sub_request_event(event, ctx)
-            return
-
-        if event.type == "sub_accept":
-            await feeding.handle_sub_accept_event(event, ctx)
-            return
-
-        if event.type == "feed_update":
-            if event.stations and len(event.stations) > 1:
-                for st in event.stations:
-                    e2 = IntentEvent(
-                        type="feed_update", confidence=event.confidence,
-                        channel_id=event.channel_id, user_id=event.user_id, message_id=event.message_id,
-                        text=event.text, has_image=event.has_image, attachment_ids=event.attachment_ids,
-                        station=st, dates=event.dates
-                    )
-                    await feeding.handle_feed_update_event(e2, ctx)
-            elif event.station:
-                await feeding.handle_feed_update_event(event, ctx)
-            return
-        
-        if event.type == "feeding_status":
-            await feeding.handle_feeding_inquiry(_intent("feeding_inquiry", {}), ctx)
-            return
-
-        if event.type == "cv_detect":
-            via_reply = bool(getattr(message, "reference", None))
-            await handle_cv_detect(_intent("cv_detect", {}), {**ctx, "message": message, "silent_on_no_image": via_reply})
-            return
-
-        if event.type == "cv_crop":
-            via_reply = bool(getattr(message, "reference", None))
-            await handle_cv_crop(_intent("cv_crop", {}), {**ctx, "message": message, "silent_on_no_image": via_reply})
-            return
-        
-        if event.type == "gmail_check_last":
-            await handle_check_last_email(_intent("gmail_check_last", {}), ctx)
-            return
 
-        if event.type == "gmail_auth_code":
-            # Extract the code/url from the original text (preserve case!) after stripping wake tokens
-            text_wo = self._strip_wake_tokens((event.text or ""), message)
-            m = AUTH_CODE_RE.search(text_wo)
-            auth = m.group(1).strip() if m else ""
-            from .handlers.dues import handle_gmail_auth_code
-            await handle_gmail_auth_code(_intent("gmail_auth_code", {"auth": auth}), ctx)
-            return
-
-        if event.type == "gmail_log_recent":
-            # Parse count from the message; default to 10
-            text_wo = self._strip_wake_tokens((event.text or ""), message)
-            m = LOG_PAST_EMAILS_RE.search(text_wo)
-            try:
-                count = int(m.group(1)) if m else 10
-            except Exception:
-                count = 10
-            from .handlers.dues import handle_log_recent_emails
-            await handle_log_recent_emails(_intent("gmail_log_recent", {"count": count}), ctx)
-            return
-        
-        if event.type == "profiles_create":
-            m = CREATE_PROFILES_RE.search(TOMCAT_PREFIX.sub("", event.text, count=1).strip())
-            if m:
-                start_id = int(m.group(1))
-                end_id = int(m.group(2) or m.group(1))
-                await handle_profiles_create(_intent("profiles_create", {"start_id": start_id, "end_id": end_id}), ctx)
-                return
-
-        if event.type == "profile_update_one":
-            m = UPDATE_PROFILE_RE.search(TOMCAT_PREFIX.sub("", event.text, count=1).strip())
-            if m:
-                await handle_profile_update_one(_intent("profile_update_one", {"cat_id": m.group(1)}), ctx)
-                return
-
-        if event.type == "profiles_update_all":
-            await handle_profiles_update_all(_intent("profiles_update_all", {}), ctx)
-            return
+    async def _on_cv_identify(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        # If event.attachment_ids came from context pairing, we’ll “replay” the other message by forging message.attachments.
+        # Easiest path: just call the existing handler; it already checks current or referenced message.
+        # If this came via a reply, suppress the handler's "attach an image" prompt when empty
+        via_reply = bool(getattr(message, "reference", None))
+        await handle_cv_identify(_intent("cv_identify", {}), {**ctx, "message": message, "silent_on_no_image": via_reply})
+
+    async def _on_sub_request(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        if getattr(event, 'stations', None) and len(event.stations) > 1:
+            for st in event.stations:
+                e2 = IntentEvent(
+                    type="sub_request", confidence=event.confidence,
+                    channel_id=event.channel_id, user_id=event.user_id, message_id=event.message_id,
+                    text=event.text, has_image=event.has_image, attachment_ids=event.attachment_ids,
+                    station=st, dates=event.dates
+                )
+                await feeding.handle_sub_request_event(e2, ctx)
+        else:
+            await feeding.handle_sub_request_event(event, ctx)
+
+    async def _on_sub_accept(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        await feeding.handle_sub_accept_event(event, ctx)
+
+    async def _on_feed_update(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        if event.stations and len(event.stations) > 1:
+            for st in event.stations:
+                e2 = IntentEvent(
+                    type="feed_update", confidence=event.confidence,
+                    channel_id=event.channel_id, user_id=event.user_id, message_id=event.message_id,
+                    text=event.text, has_image=event.has_image, attachment_ids=event.attachment_ids,
+                    station=st, dates=event.dates
+                )
+                await feeding.handle_feed_update_event(e2, ctx)
+        elif event.station:
+            await feeding.handle_feed_update_event(event, ctx)
+
+    async def _on_feeding_status(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        await feeding.handle_feeding_inquiry(_intent("feeding_inquiry", {}), ctx)
+
+    async def _on_cv_detect(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        via_reply = bool(getattr(message, "reference", None))
+        await handle_cv_detect(_intent("cv_detect", {}), {**ctx, "message": message, "silent_on_no_image": via_reply})
+
+    async def _on_cv_crop(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        via_reply = bool(getattr(message, "reference", None))
+        await handle_cv_crop(_intent("cv_crop", {}), {**ctx, "message": message, "silent_on_no_image": via_reply})
+
+    async def _on_gmail_check_last(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        await handle_check_last_email(_intent("gmail_check_last", {}), ctx)
+
+    async def _on_gmail_auth_code(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        # Extract the code/url from the original text (preserve case!) after stripping wake tokens
+        text_wo = self._strip_wake_tokens((event.text or ""), message)
+        m = AUTH_CODE_RE.search(text_wo)
+        auth = m.group(1).strip() if m else ""
+        from .handlers.dues import handle_gmail_auth_code
+        await handle_gmail_auth_code(_intent("gmail_auth_code", {"auth": auth}), ctx)
+
+    async def _on_gmail_log_recent(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        # Parse count from the message; default to 10
+        text_wo = self._strip_wake_tokens((event.text or ""), message)
+        m = LOG_PAST_EMAILS_RE.search(text_wo)
+        try:
+            count = int(m.group(1)) if m else 10
+        except Exception:
+            count = 10
+        from .handlers.dues import handle_log_recent_emails
+        await handle_log_recent_emails(_intent("gmail_log_recent", {"count": count}), ctx)
 
-        if event.type == "silent_mode":
-            # Admin-only; no chatter on success, because silent mode rules.
-            author = message.author
-            perms = getattr(getattr(author, "guild_permissions", None), "administrator", False)
-            m = SILENT_CMD.search(TOMCAT_PREFIX.sub("", event.text, count=1))
-            on_str = m.group(1).lower() if m else ""
-            on = (on_str == "on")
-            if perms:
-                settings.silent_mode = on
-                log_action("silent_mode", f"by={author.id}", "on" if on else "off")
-            else:
-                log_action("silent_mode_denied", f"by={author.id}", "not_admin")
-            return
+    async def _on_profiles_create(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        m = CREATE_PROFILES_RE.search(TOMCAT_PREFIX.sub("", event.text, count=1).strip())
+        if m:
+            start_id = int(m.group(1))
+            end_id = int(m.group(2) or m.group(1))
+            await handle_profiles_create(_intent("profiles_create", {"start_id": start_id, "end_id": end_id}), ctx)
 
-        if event.type == "manual_8pm":
-            # Admin-only via settings.admin_ids or guild admin
-            author = message.author
-            is_admin = int(getattr(author,'id',0)) in (getattr(settings,'admin_ids',[]) or []) or getattr(getattr(author, 'guild_permissions', None), 'administrator', False)
-            if not is_admin:
-                log_action("manual_8pm_denied", f"by={getattr(author,'id',0)}", "not_admin")
-                return
-            from .handlers.feeding import handle_manual_8pm_preview
-            await handle_manual_8pm_preview(_intent("manual_8pm", {}), {**ctx, "bot": ctx.get("bot")})
+    async def _on_profile_update_one(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        m = UPDATE_PROFILE_RE.search(TOMCAT_PREFIX.sub("", event.text, count=1).strip())
+        if m:
+            await handle_profile_update_one(_intent("profile_update_one", {"cat_id": m.group(1)}), ctx)
+
+    async def _on_profiles_update_all(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        await handle_profiles_update_all(_intent("profiles_update_all", {}), ctx)
+
+    async def _on_silent_mode(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        # Admin-only; no chatter on success, because silent mode rules.
+        author = message.author
+        perms = getattr(getattr(author, "guild_permissions", None), "administrator", False)
+        m = SILENT_CMD.search(TOMCAT_PREFIX.sub("", event.text, count=1))
+        on_str = m.group(1).lower() if m else ""
+        on = (on_str == "on")
+        if perms:
+            settings.silent_mode = on
+            log_action("silent_mode", f"by={author.id}", "on" if on else "off")
+        else:
+            log_action("silent_mode_denied", f"by={author.id}", "not_admin")
+
+    async def _on_manual_8pm(self, event: IntentEvent, message: discord.Message, ctx: Dict[str, Any]) -> None:
+        # Admin-only via settings.admin_ids or guild admin
+        author = message.author
+        is_admin = _is_admin(author)
+        if not is_admin:
+            log_action("manual_8pm_denied", f"by={getattr(author,'id',0)}", "not_admin")
             return
-        
-
+        from .handlers.feeding import handle_manual_8pm_preview
+        await handle_manual_8pm_preview(_intent("manual_8pm", {}), {**ctx, "bot": ctx.get("bot")})
 
 
     # ---------- clarify feed (author-locked) ----------
@@ -974,7 +1023,7 @@ class IntentRouter:
 
     # ---------- helpers: entity, context, dates ----------
     def _normalize_text(self, s: str) -> str:
-        return re.sub(r"\s+", " ", (s or "").strip().lower())
+        return _WS_RE.sub(" ", (s or "").strip().lower())
 
     def _extract_best_entity(self, text: str, want: str, allow_model: bool=False) -> Optional[str]:
         """want in {'cat','station'}. Try aliases, then fuzzy, then optional NLP scorer."""
@@ -1017,10 +1066,11 @@ class IntentRouter:
             except Exception:
                 pass
         # Default cat path: match against display-name vocab (catch simple mentions like "Twix")
-        names: List[str] = []
-        for nm in (alias_vocab()[f"{want}s"]):
-            if re.search(rf"\b{re.escape(nm.lower())}\b", text.lower()):
-                names.append(nm)
+        any_rx, per_name = _vocab_matchers(want)
+        text_low = text.lower()
+        if any_rx is None or not any_rx.search(text_low):
+            return []
+        names: List[str] = [nm for nm, rx in per_name if rx.search(text_low)]
         # unique, preserve order
         seen = set(); out = []
         for n in names:
@@ -1030,7 +1080,7 @@ class IntentRouter:
 
     def _best_token_for_fuzzy(self, text: str) -> Optional[str]:
         # pick the longest token-ish word as candidate
-        toks = [t for t in re.split(r"[^a-z0-9]+", text.lower()) if t]
+        toks = [t for t in _NON_ALNUM_RE.split(text.lower()) if t]
         if not toks:
             return None
         return max(toks, key=len)
@@ -1110,13 +1160,13 @@ class IntentRouter:
             out.append(today - timedelta(days=1))
 
         # on <weekday> -> previous occurrence (most recent in past)
-        m_on = re.search(r"\bon\s+(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun|sunday|monday|tuesday|wednesday|thursday|friday|saturday)\b", text)
+        m_on = ON_WEEKDAY_RE.search(text)
         if m_on:
             word = m_on.group(1)[:3]
             out.append(self._prev_weekday(today, WEEKDAYS[word]))
 
         # this/next weekday, or bare weekday -> next
-        m = re.search(r"\b(this|next)?\s*(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun|sunday|monday|tuesday|wednesday|thursday|friday|saturday)\b", text)
+        m = WEEKDAY_RE.search(text)
         if m:
             word = m.group(2)[:3]
             target = self._next_weekday(today, WEEKDAYS[word])
@@ -1124,7 +1174,7 @@ class IntentRouter:
             out.append(target)
 
         # numeric range “21st to 28th”, “21-28”
-        m2 = re.search(r"\b(\d{1,2})(?:st|nd|rd|th)?\s*(?:to|-)\s*(\d{1,2})(?:st|nd|rd|th)?\b", text)
+        m2 = DAY_RANGE_RE.search(text)
         if m2:
             d1 = int(m2.group(1)); d2 = int(m2.group(2))
             # if today ≤ 20 assume this month; if today ≥ 22 assume next month; 21/22 edge okay
@@ -1245,12 +1295,12 @@ class IntentRouter:
 
     def _strip_wake_tokens(self, text_norm: str, message: discord.Message) -> str:
         s = TOMCAT_PREFIX.sub("", text_norm, count=1).strip()
-        if _BOT_ID_INT:
+        if _BOT_MENTION_STRIP_RE:
             try:
-                s = re.sub(rf"\s*<@!?{_BOT_ID_INT}>\s*[:,\-]*\s*", " ", s).strip()
+                s = _BOT_MENTION_STRIP_RE.sub(" ", s).strip()
             except Exception:
                 pass
-        s = re.sub(r"\s+", " ", s).strip()
+        s = _WS_RE.sub(" ", s).strip()
         return s
 
 def _intent(name: str, data: Dict[str, Any]) -> Intent:
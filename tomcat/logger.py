@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 import json
+import threading
+import time
 from pathlib import Path
 
 LOG_DIR_MACHINE = Path("logs/machine")
@@ -15,6 +17,10 @@ TZ = ZoneInfo("America/Chicago")
 _COLW = {"event": 8, "col1": 25, "col2": 45}
 _TAILW = 80  # soft cap for optional trailing text (not padded)
 
+# log_event runs on the loop thread, log_events on the pool; one lock keeps
+# their appends to the same day files from interleaving.
+_WRITE_LOCK = threading.Lock()
+
 def _pad(s: str, width: int) -> str:
     """Fit content to a fixed-width column: truncate with '...' if too long, pad spaces if short."""
     s = str(s or "")
@@ -42,13 +48,23 @@ def _human_line(ts_ct: str, event: str, col1: str = "", col2: str = "", tail: st
     return head
 
 
-def log_event(event_data: dict) -> str:
-    # Write machine log (raw NDJSON)
-    with open(LOG_DIR_MACHINE / f"{datetime.now(TZ):%Y-%m-%d}.ndjson", "a", encoding="utf-8") as f:
-        f.write(json.dumps(event_data, ensure_ascii=False) + "\n")
-    
-    now = datetime.now(TZ)
-    ts_ct = f"{now:%m/%d/%Y %I:%M:%S}.{now.microsecond//1000:03d} {'AM' if now.hour < 12 else 'PM'}"
+# (epoch second, "YYYY-MM-DD", "MM/DD/YYYY HH:MM:SS", "AM"/"PM") for the last second stamped.
+# Swapped as one tuple so concurrent writers (loop thread + log pool) never see a torn entry.
+_stamp_cache: tuple[int, str, str, str] = (-1, "", "", "")
+
+def _stamp(t: float) -> tuple[str, str]:
+    """Return (log file day, human timestamp) for epoch t; datetime work happens once per second."""
+    global _stamp_cache
+    sec = int(t)
+    cached = _stamp_cache
+    if cached[0] != sec:
+        now = datetime.fromtimestamp(sec, TZ)
+        cached = (sec, f"{now:%Y-%m-%d}", f"{now:%m/%d/%Y %I:%M:%S}", "AM" if now.hour < 12 else "PM")
+        _stamp_cache = cached
+    return cached[1], f"{cached[2]}.{int((t - sec) * 1000):03d} {cached[3]}"
+
+
+def _format_human(event_data: dict, ts_ct: str) -> str:
 
     kind = str(event_data.get("event", "event")).lower()
 
@@ -202,12 +218,46 @@ def log_event(event_data: dict) -> str:
         data_copy = dict(event_data)
         data_copy.pop("ts", None)
         human_line = _human_line(ts_ct, "Event", "", "", json.dumps(data_copy, ensure_ascii=False))
+    return human_line
+
 
-    with open(LOG_DIR_HUMAN / f"{datetime.now(TZ):%Y-%m-%d}.log", "a", encoding="utf-8") as f:
-        f.write(human_line + "\n")
+def log_event(event_data: dict, t: float | None = None) -> str:
+    day, ts_ct = _stamp(time.time() if t is None else t)
+    m_line = json.dumps(event_data, ensure_ascii=False)
+    human_line = _format_human(event_data, ts_ct)
+    with _WRITE_LOCK:
+        # Write machine log (raw NDJSON)
+        with open(LOG_DIR_MACHINE / f"{day}.ndjson", "a", encoding="utf-8") as f:
+            f.write(m_line + "\n")
+        with open(LOG_DIR_HUMAN / f"{day}.log", "a", encoding="utf-8") as f:
+            f.write(human_line + "\n")
     return human_line
 
 
+def log_events(batch: list[tuple[float, dict]]) -> None:
+    """Write a batch of (epoch, event) records with one open+write per log file.
+    Each record keeps the time it was queued, not the time of the flush.
+    """
+    machine: dict[str, list[str]] = {}
+    human: dict[str, list[str]] = {}
+    for t, ev in batch:
+        try:
+            day, ts_ct = _stamp(t)
+            m_line = json.dumps(ev, ensure_ascii=False)
+            h_line = _format_human(ev, ts_ct)
+        except Exception:
+            continue
+        machine.setdefault(day, []).append(m_line)
+        human.setdefault(day, []).append(h_line)
+    with _WRITE_LOCK:
+        for day, lines in machine.items():
+            with open(LOG_DIR_MACHINE / f"{day}.ndjson", "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        for day, lines in human.items():
+            with open(LOG_DIR_HUMAN / f"{day}.log", "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
 def log_action(name: str, trigger: str, output: str) -> str:
     return log_event({
         "event": "action",
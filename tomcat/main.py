@@ -1,29 +1,29 @@
 from __future__ import annotations
 import asyncio
 import time
-from typing import Any, Dict, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Union
 
 import discord
 from discord.ext import commands
 from datetime import datetime, timezone
 
 from .config import settings
-from .logger import log_event, log_action  # noqa: F401  #If unused right now
-from .spam import is_spam
+from .runtime import run_blocking
+from .logger import log_event, log_events, log_action  # noqa: F401  #If unused right now
+from .spam import check_spam, _warm_nlp
 from .intent_router import IntentRouter, Intent
 from .handlers.misc import handle_channel_image_intake as _handle_image_intake, start_profile_scheduler
 
 
-intent_router = IntentRouter()
+# Small dedicated pool for check_spam: it runs per message, and sharing the Sheets/log
+# pool would leave message handling queued behind slow HTTP calls (and vice versa)
+_SPAM_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tomcat-spam")
 
-# ------- Discord intents & bot -------
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-intents.guilds = True
-intents.reactions = True
-
-bot = commands.Bot(command_prefix=settings.command_prefix, intents=intents)
+# Set by build_bot(); importing this module does not create a client or load models
+intent_router: IntentRouter
+bot: commands.Bot
 
 # ------- Import real handlers -------
 # Cats / Feeding and Dues already match (intent, ctx) in your tree
@@ -86,18 +86,30 @@ def _user_label(u: Union[discord.Member, discord.User]) -> str:
 
 
 
-def _channel_label(ch: discord.abc.Messageable) -> str:
-    # Guild text channel
-    if isinstance(ch, discord.TextChannel):
-        return f"#{ch.name}"
+def _label_thread(ch: discord.Thread) -> str:
     # Thread inside a parent channel; parent can be None so guard it
-    if isinstance(ch, discord.Thread):
-        parent = getattr(ch, "parent", None)
-        parent_prefix = f"#{parent.name}/" if parent and getattr(parent, "name", None) else ""
-        return f"{parent_prefix}{ch.name}"
+    parent = getattr(ch, "parent", None)
+    parent_prefix = f"#{parent.name}/" if parent and getattr(parent, "name", None) else ""
+    return f"{parent_prefix}{ch.name}"
+
+
+def _label_dm(ch: discord.DMChannel) -> str:
     # 1:1 DM (recipient is Optional[User])
-    if isinstance(ch, discord.DMChannel):
-        return "DM"
+    return "DM"
+
+
+# Exact-type dispatch: one dict lookup instead of an isinstance chain per log line
+_CHANNEL_LABELERS = {
+    discord.TextChannel: lambda c: f"#{c.name}",
+    discord.Thread: _label_thread,
+    discord.DMChannel: _label_dm,
+}
+
+
+def _channel_label(ch: discord.abc.Messageable) -> str:
+    fn = _CHANNEL_LABELERS.get(type(ch))
+    if fn is not None:
+        return fn(ch)
     # Group DM, Stage, Voice, PartialMessageable, whatever else
     name = getattr(ch, "name", None)
     return f"#{name}" if isinstance(name, str) and name else ch.__class__.__name__.lower()
@@ -132,24 +144,136 @@ async def handle_cat_photo(intent: Intent, ctx: Dict[str, Any]) -> None:
 
 
 
+class _LRU(OrderedDict):
+    """Fixed-capacity dict: inserts/updates mark a key as newest, oldest keys are evicted."""
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 # ------- Optional: invite cache you already had -------
 invites_cache: dict[int, dict[str, int]] = {}
-message_cache: dict[int, str] = {}
+# Refreshed on every join, so the missing-permission warning is logged once per guild
+_invite_perm_warned: set[int] = set()
 
-async def _refresh_invites(guild: discord.Guild):
-    """Refreshes the invite cache for a given guild."""
+async def _refresh_invites(guild: discord.Guild) -> dict[str, discord.Invite]:
+    """Refreshes the invite cache for a given guild and returns the fetched invites by code."""
     if not guild.me.guild_permissions.manage_guild:
-        print(f"Warning: Missing 'Manage Server' permission in '{guild.name}' to track invites.")
-        return
-    invites = await guild.invites()
-    invites_cache[guild.id] = {inv.code: inv.uses or 0 for inv in invites}
+        if guild.id not in _invite_perm_warned:
+            _invite_perm_warned.add(guild.id)
+            log_action("invites_warning", f"guild={guild.name}", "Missing 'Manage Server' permission to track invites")
+        return {}
+    invites = {inv.code: inv for inv in await guild.invites()}
+    invites_cache[guild.id] = {code: inv.uses or 0 for code, inv in invites.items()}
+    return invites
+
+# ------- Reaction lookups -------
+# Reactions arrive as raw payloads, so logging a preview means a REST fetch of the
+# message. Cache (preview, author) per message for a few minutes so emoji storms
+# on one post cost a single fetch.
+_REACTION_PREVIEW_TTL = 300.0
+_reaction_previews: _LRU = _LRU(4096)  # message_id -> (fetched_at, preview, author_name)
+
+async def _reaction_preview(ch, message_id: int) -> tuple[str, str]:
+    hit = _reaction_previews.get(message_id)
+    if hit is not None and time.monotonic() - hit[0] < _REACTION_PREVIEW_TTL:
+        _reaction_previews.move_to_end(message_id)
+        return hit[1], hit[2]
+    if not ch or not hasattr(ch, 'fetch_message'):
+        return "", ""
+    try:
+        msg = await ch.fetch_message(message_id)
+    except Exception:
+        return "", ""
+    content = msg.clean_content if isinstance(getattr(msg, 'content', None), str) else ""
+    preview = content[:40] + ("..." if len(content) > 40 else "")
+    author_name = _user_label(getattr(msg, 'author', None))
+    _reaction_previews[message_id] = (time.monotonic(), preview, author_name)
+    return preview, author_name
+
+def _reaction_user(payload: discord.RawReactionActionEvent) -> str:
+    # payload.member is only set for guild adds; fall back to the client's user cache
+    u = getattr(payload, 'member', None) or bot.get_user(int(payload.user_id))
+    return _user_label(u) if u is not None else str(payload.user_id)
+
+# ------- Buffered event logging -------
+# Gateway handlers only enqueue; one drain task writes batches off the loop thread.
+_LOG_Q: asyncio.Queue[tuple[float, dict]] = asyncio.Queue()
+_LOG_BATCH_MAX = 256
+
+def _queue_log(event_data: dict) -> None:
+    # Stamp at enqueue time (one time.time(), no datetime) so batching doesn't skew log times
+    _LOG_Q.put_nowait((time.time(), event_data))
+
+_LOG_FLUSH_SEC = 0.25  # coalesce bursts (reaction storms, raids) into one write per file
+
+def _flush_logs(batch: list[tuple[float, dict]]) -> None:
+    try:
+        log_events(batch)
+    except Exception:
+        pass
+
+_log_inflight: Optional[asyncio.Future] = None
+
+async def _log_drain() -> None:
+    global _log_inflight
+    buf: list[tuple[float, dict]] = []
+    while True:
+        buf.append(await _LOG_Q.get())
+        while not _LOG_Q.empty() and len(buf) < _LOG_BATCH_MAX:
+            buf.append(_LOG_Q.get_nowait())
+        # Shielded so cancelling the drain at shutdown can't orphan a half-taken batch
+        _log_inflight = asyncio.ensure_future(run_blocking(_flush_logs, list(buf)))
+        buf.clear()
+        await asyncio.shield(_log_inflight)
+        await asyncio.sleep(_LOG_FLUSH_SEC)
+
+# ------- Background tasks -------
+# Strong references keep tasks from being GC'd mid-run; keyed by name so a
+# reconnect (on_ready fires again) doesn't start a second copy of a loop.
+_bg_tasks: dict[str, asyncio.Task] = {}
+
+def _spawn(name: str, coro) -> asyncio.Task:
+    running = _bg_tasks.get(name)
+    if running is not None and not running.done():
+        coro.close()
+        return running
+    t = asyncio.create_task(coro, name=f"tomcat-{name}")
+    _bg_tasks[name] = t
+    return t
+
+async def _shutdown_logs() -> None:
+    """Stop the drain and write whatever is still queued (or sleeping in the batch window)."""
+    t = _bg_tasks.get("log_drain")
+    if t is not None and not t.done():
+        t.cancel()
+        try:
+            await t
+        except (asyncio.CancelledError, Exception):
+            pass
+    if _log_inflight is not None and not _log_inflight.done():
+        try:
+            await _log_inflight
+        except Exception:
+            pass
+    rest: list[tuple[float, dict]] = []
+    while not _LOG_Q.empty():
+        rest.append(_LOG_Q.get_nowait())
+    if rest:
+        _flush_logs(rest)
 
 # ------- Lifecycle -------
-@bot.event
 async def on_ready():
+    _spawn("log_drain", _log_drain())
     print(f"[TomCat] Logged in as {bot.user} in {len(bot.guilds)} guild(s).")
-    # Machine + human “ONLINE” handled by logger.log_event
-    log_event({
+    # Machine + human “ONLINE” handled by logger.log_event (via the drain)
+    _queue_log({
         "event": "online",
         "user": str(bot.user),
         "guild_count": len(bot.guilds),
@@ -162,27 +286,30 @@ async def on_ready():
             from .handlers.misc import _open_ws as _open_ws_misc
             for ch_id, tab in (settings.channel_sheet_map or {}).items():
                 try:
-                    ws = _open_ws_misc(tab)
+                    ws = await run_blocking(_open_ws_misc, tab)
                     if ws:
-                        log_event({"event":"health","component":"image_tab","status":"ok","channel_id": ch_id, "tab": tab})
+                        _queue_log({"event":"health","component":"image_tab","status":"ok","channel_id": ch_id, "tab": tab})
                     else:
-                        log_event({"event":"health","component":"image_tab","status":"missing","channel_id": ch_id, "tab": tab})
+                        _queue_log({"event":"health","component":"image_tab","status":"missing","channel_id": ch_id, "tab": tab})
                 except Exception as e:
-                    log_event({"event":"health","component":"image_tab","status":"error","channel_id": ch_id, "tab": tab, "error": str(e)})
+                    _queue_log({"event":"health","component":"image_tab","status":"error","channel_id": ch_id, "tab": tab, "error": str(e)})
         except Exception as e:
-            log_event({"event":"health","component":"image_tab","status":"error","error": str(e)})
+            _queue_log({"event":"health","component":"image_tab","status":"error","error": str(e)})
         try:
             # Check feeding checklist tab
             from .handlers.feeding import _open_feeding_ws
-            ws = _open_feeding_ws()
+            ws = await run_blocking(_open_feeding_ws)
             if ws:
-                log_event({"event":"health","component":"feeding_tab","status":"ok"})
+                _queue_log({"event":"health","component":"feeding_tab","status":"ok"})
             else:
-                log_event({"event":"health","component":"feeding_tab","status":"missing"})
+                _queue_log({"event":"health","component":"feeding_tab","status":"missing"})
         except Exception as e:
-            log_event({"event":"health","component":"feeding_tab","status":"error","error": str(e)})
+            _queue_log({"event":"health","component":"feeding_tab","status":"error","error": str(e)})
 
-    asyncio.create_task(_health_checks())
+    _spawn("health_checks", _health_checks())
+    # Load the spam model now; messages skip the NLP backstop until it's ready. Its own
+    # thread, so the load doesn't hold a Sheets/log or spam worker for its whole duration
+    _spawn("spam_nlp_warm", asyncio.to_thread(_warm_nlp, settings))
 
     # Seed invite caches for all guilds (for join attribution)
     try:
@@ -194,26 +321,25 @@ async def on_ready():
     except Exception:
         pass
 
-    asyncio.create_task(start_profile_scheduler(bot))
+    _spawn("profile_scheduler", start_profile_scheduler(bot))
     # start feeding scheduler after the bot is ready and loop is running
-    asyncio.create_task(start_feeding_scheduler(bot))
+    _spawn("feeding_scheduler", start_feeding_scheduler(bot))
     # Start Gmail logging scheduler if enabled
     try:
         if getattr(settings, "gmail_enabled", False):
-            asyncio.create_task(start_gmail_logging_scheduler(bot))
+            _spawn("gmail_scheduler", start_gmail_logging_scheduler(bot))
     except Exception:
         pass
 
 
 # ------- Message entrypoint -------
-@bot.event
 async def on_message(message: discord.Message):
     if message.author.bot:
         return
         
 
     # Human + machine log of the incoming message
-    log_event({
+    _queue_log({
         "event": "message",
         "author": _user_label(message.author),
         "channel": _channel_label(message.channel),
@@ -222,8 +348,11 @@ async def on_message(message: discord.Message):
     })
 
     # Spam protection (text + heuristics + NLP backstop for new/untrusted accounts)
-    from .spam import check_spam
-    spam_flag, reason = check_spam(message, settings)
+    if message.content:
+        # Spam scoring (regex + ONNX backstop) is synchronous; keep it off the gateway coroutine
+        spam_flag, reason = await asyncio.get_running_loop().run_in_executor(_SPAM_POOL, check_spam, message, settings)
+    else:
+        spam_flag, reason = False, "empty"
     if spam_flag:
         # Log and notify in logging channel, then delete the message
         try:
@@ -235,7 +364,7 @@ async def on_message(message: discord.Message):
                 decision = "kept"
 
             # Write log line
-            log_event({
+            _queue_log({
                 "event": "spam",
                 "user": _user_label(message.author),
                 "channel": _channel_label(message.channel),
@@ -266,6 +395,7 @@ async def on_message(message: discord.Message):
         except Exception:
             pass
         return
+
     # Channel → Sheet image intake (unprompted, only in mapped channels)
     try:
         if getattr(message, "attachments", None) and settings.channel_sheet_map and int(message.channel.id) in settings.channel_sheet_map:
@@ -273,40 +403,56 @@ async def on_message(message: discord.Message):
     except Exception as e:
         log_action("image_intake_error", f"channel={getattr(message.channel,'id','?')}", str(e))
 
+    # Prefix commands (e.g. !members) go to commands.Bot, not the NL router
+    # (after intake, so a captioned photo like "!look" still reaches the sheet)
+    prefix = settings.command_prefix
+    if prefix and (message.content or "").startswith(prefix):
+        await bot.process_commands(message)
+        return
+
     # Lightweight fun triggers (e.g., "meow") anywhere; safe_send respects silent mode
     try:
         await _handle_misc_raw(message, now_ts=time.time(), allow_in_channels=None)
     except Exception:
         pass
 
-    # Build ctx once
-    ctx: Dict[str, Any] = {
-        "bot": bot,
-        "message": message,
-        "channel": message.channel,
-        "author": message.author,
-    }
+    # Nothing for the router to classify (no text, no attachments): skip building ctx
+    if not message.content and not getattr(message, "attachments", None):
+        return
 
     # Global mute: while silent_mode is ON, route everything through a MuteChannel/Message
     if settings.silent_mode:
         muted_ch = _MuteChannel(message.channel, _channel_label)
         muted_msg = _MuteMessage(message, muted_ch)
-        ctx["channel"] = muted_ch
-        ctx["message"] = muted_msg
+        ctx: Dict[str, Any] = {
+            "bot": bot,
+            "message": muted_msg,
+            "channel": muted_ch,
+            "author": message.author,
+        }
         await intent_router.handle_message(muted_msg, ctx)
         return
 
     # Normal path
+    ctx = {
+        "bot": bot,
+        "message": message,
+        "channel": message.channel,
+        "author": message.author,
+    }
     await intent_router.handle_message(message, ctx)
 
 
 # ------- Edit/Delete logging -------
-@bot.event
 async def on_message_edit(before: discord.Message, after: discord.Message):
     try:
-        if before.author.bot:
+        if before.author is None or before.author.bot:
+            return
+        # MESSAGE_UPDATE also fires for embed resolution, pins, etc.; only log real text edits
+        if before.content == after.content:
             return
-        log_event({
+        _reaction_previews.pop(after.id, None)
+        _queue_log({
             "event": "message_edit",
             "author": _user_label(before.author),
             "channel": _channel_label(before.channel),
@@ -316,12 +462,11 @@ async def on_message_edit(before: discord.Message, after: discord.Message):
     except Exception:
         pass
 
-@bot.event
 async def on_message_delete(message: discord.Message):
     try:
         if message.author and message.author.bot:
             return
-        log_event({
+        _queue_log({
             "event": "message_delete",
             "author": _user_label(getattr(message, 'author', type('X', (), {'name':'unknown'})())),
             "channel": _channel_label(getattr(message, 'channel', type('Y', (), {'name':'unknown'})())),
@@ -332,18 +477,15 @@ async def on_message_delete(message: discord.Message):
 
 
 # ------- Member join/leave + invite tracking -------
-@bot.event
 async def on_member_join(member: discord.Member):
     try:
         guild = member.guild
         # Compute account age in days
         created = getattr(member, 'created_at', None)
-        from datetime import timezone
         age_days = None
         if created:
             try:
-                now = datetime.now(timezone.utc)
-                age_days = (now - created).days
+                age_days = int((time.time() - created.timestamp()) // 86400)
             except Exception:
                 age_days = None
 
@@ -352,20 +494,15 @@ async def on_member_join(member: discord.Member):
         inviter_id = None
         try:
             before = invites_cache.get(guild.id, {})
-            invites = await guild.invites()
-            after = {inv.code: (inv.uses or 0) for inv in invites}
-            for inv in invites:
-                b = before.get(inv.code, 0)
-                a = after.get(inv.code, 0)
-                if a > b:
-                    code_used = inv.code
-                    inviter_id = getattr(inv.inviter, 'id', None)
-                    break
-            invites_cache[guild.id] = after
+            after = await _refresh_invites(guild)
+            used = next((inv for code, inv in after.items() if (inv.uses or 0) > before.get(code, 0)), None)
+            if used is not None:
+                code_used = used.code
+                inviter_id = getattr(used.inviter, 'id', None)
         except Exception:
             pass
 
-        log_event({
+        _queue_log({
             "event": "member_join",
             "user": _user_label(member),
             "user_id": int(getattr(member, 'id', 0)),
@@ -378,10 +515,9 @@ async def on_member_join(member: discord.Member):
     except Exception:
         pass
 
-@bot.event
 async def on_member_remove(member: discord.Member):
     try:
-        log_event({
+        _queue_log({
             "event": "member_leave",
             "user": _user_label(member),
             "user_id": int(getattr(member, 'id', 0)),
@@ -391,7 +527,6 @@ async def on_member_remove(member: discord.Member):
     except Exception:
         pass
 
-@bot.event
 async def on_invite_create(invite: discord.Invite):
     try:
         g = invite.guild
@@ -400,7 +535,6 @@ async def on_invite_create(invite: discord.Invite):
     except Exception:
         pass
 
-@bot.event
 async def on_invite_delete(invite: discord.Invite):
     try:
         g = invite.guild
@@ -411,27 +545,16 @@ async def on_invite_delete(invite: discord.Invite):
 
 
 # ------- Reactions and role changes logging -------
-@bot.event
 async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     try:
         # Ignore bot reactions
         if payload.user_id == getattr(bot.user, 'id', None):
             return
         ch = bot.get_channel(int(payload.channel_id))
-        msg = None
-        preview = ""
-        author_name = ""
-        if ch and hasattr(ch, 'fetch_message'):
-            try:
-                msg = await ch.fetch_message(int(payload.message_id))
-                content = msg.clean_content if isinstance(getattr(msg, 'content', None), str) else ""
-                preview = content[:40] + ("..." if len(content) > 40 else "")
-                author_name = _user_label(getattr(msg, 'author', None))
-            except Exception:
-                pass
-        log_event({
+        preview, author_name = await _reaction_preview(ch, int(payload.message_id))
+        _queue_log({
             "event": "reaction_add",
-            "user": _user_label(getattr(payload, 'member', None)) or str(payload.user_id),
+            "user": _reaction_user(payload),
             "channel": _channel_label(ch) if ch else str(payload.channel_id),
             "message_id": int(payload.message_id),
             "emoji": str(payload.emoji),
@@ -441,24 +564,13 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     except Exception:
         pass
 
-@bot.event
 async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
     try:
         ch = bot.get_channel(int(payload.channel_id))
-        msg = None
-        preview = ""
-        author_name = ""
-        if ch and hasattr(ch, 'fetch_message'):
-            try:
-                msg = await ch.fetch_message(int(payload.message_id))
-                content = msg.clean_content if isinstance(getattr(msg, 'content', None), str) else ""
-                preview = content[:40] + ("..." if len(content) > 40 else "")
-                author_name = _user_label(getattr(msg, 'author', None))
-            except Exception:
-                pass
-        log_event({
+        preview, author_name = await _reaction_preview(ch, int(payload.message_id))
+        _queue_log({
             "event": "reaction_remove",
-            "user": _user_label(getattr(payload, 'member', None)) or str(payload.user_id),
+            "user": _reaction_user(payload),
             "channel": _channel_label(ch) if ch else str(payload.channel_id),
             "message_id": int(payload.message_id),
             "emoji": str(payload.emoji),
@@ -468,7 +580,6 @@ async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
     except Exception:
         pass
 
-@bot.event
 async def on_member_update(before: discord.Member, after: discord.Member):
     try:
         # Compare role IDs
@@ -484,7 +595,7 @@ async def on_member_update(before: discord.Member, after: discord.Member):
                 role = after.guild.get_role(rid)
                 out.append(getattr(role, 'name', str(rid)))
             return out
-        log_event({
+        _queue_log({
             "event": "member_update",
             "user": _user_label(after),
             "user_id": int(getattr(after,'id',0)),
@@ -496,9 +607,8 @@ async def on_member_update(before: discord.Member, after: discord.Member):
         pass
 
 # Optional: parity command (kept tiny)
-@bot.command(name="members")
 async def members(ctx: commands.Context):
-    log_event({
+    _queue_log({
         "ts": datetime.now(timezone.utc).isoformat(),
         "event": "command",
         "cmd": "members",
@@ -506,8 +616,47 @@ async def members(ctx: commands.Context):
     })
     await ctx.send("Members count: (hook up to Members sheet)")
 
+_EVENT_HANDLERS = (
+    on_ready,
+    on_message,
+    on_message_edit,
+    on_message_delete,
+    on_member_join,
+    on_member_remove,
+    on_invite_create,
+    on_invite_delete,
+    on_raw_reaction_add,
+    on_raw_reaction_remove,
+    on_member_update,
+)
+
+
+class _TomCatBot(commands.Bot):
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            await _shutdown_logs()
+
+
+def build_bot() -> commands.Bot:
+    """Create the Discord client, the intent router, and register event handlers."""
+    global bot, intent_router
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    intents.guilds = True
+    intents.reactions = True
+
+    bot = _TomCatBot(command_prefix=settings.command_prefix, intents=intents)
+    intent_router = IntentRouter()
+    for fn in _EVENT_HANDLERS:
+        bot.event(fn)
+    bot.command(name="members")(members)
+    return bot
+
 def run():
-    bot.run(settings.discord_token)
+    build_bot().run(settings.discord_token)
 
 if __name__ == "__main__":
     run()
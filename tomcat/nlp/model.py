@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Optional, Tuple, List, Dict, Any
 import math
+import os
 
 # Optional ONNX + Tokenizers wrapper (zero‑shot via MNLI style).
 # If missing, router gracefully falls back to rules and returns None here.
@@ -16,15 +17,74 @@ _DEFAULT_LABELS = [
 ]
 
 
+# Flattened (label, hypothesis) pairs scored by predict_intent in a single batch
+_INTENT_HYPOTHESES: List[Tuple[str, str]] = [
+    (label, hyp)
+    for label, hyps in [
+        ("show_photo", [
+            "The user asks to show a cat photo.",
+            "The user requests a photo of a cat.",
+            "They want TomCat to send a cat picture.",
+        ]),
+        ("who_is", [
+            "The user asks who a specific cat is.",
+            "They want cat information or a profile.",
+        ]),
+        ("cv_identify", [
+            "The user asks to identify a cat in a photo.",
+            "They ask to classify the cat in the image.",
+        ]),
+        ("feed_update", [
+            "The user says a feeding occurred or bowl was filled.",
+        ]),
+        ("sub_request", [
+            "The user asks someone to cover a feeding shift.",
+        ]),
+        ("sub_accept", [
+            "The user volunteers to cover a feeding shift.",
+        ]),
+    ]
+    for hyp in hyps
+]
+
+# Very long premises go through the per-pair path instead of padding every row out to them
+_BATCH_MAX_TOKENS = 512
+
+
 class NLPModel:
     def __init__(self, session, tokenizer, labels: List[str]):
         self.session = session
         self.tokenizer = tokenizer
         self.intent_labels = labels or _DEFAULT_LABELS
+        # Resolve ORT input names once; exported models differ in prefixes and optional inputs
+        self._ids_name: Optional[str] = None
+        self._attn_name: Optional[str] = None
+        self._tok_types_name: Optional[str] = None
+        for i in session.get_inputs():
+            lname = i.name.lower()
+            if lname.endswith("input_ids"):
+                self._ids_name = i.name
+            elif lname.endswith("attention_mask"):
+                self._attn_name = i.name
+            elif lname.endswith("token_type_ids"):
+                self._tok_types_name = i.name
+        # Index of the (batch, 3) MNLI logits output; None means search the outputs per run
+        self._logits_idx: Optional[int] = None
+        try:
+            for idx, o in enumerate(session.get_outputs()):
+                shape = list(getattr(o, "shape", None) or [])
+                if len(shape) == 2 and shape[1] == 3:
+                    self._logits_idx = idx
+                    break
+        except Exception:
+            pass
 
     @staticmethod
     def maybe_load(settings) -> Optional["NLPModel"]:
         model_path = getattr(settings, "nlp_model_path", None)
+        int8_path = getattr(settings, "nlp_model_int8_path", None)
+        if int8_path and os.path.exists(int8_path):
+            model_path = int8_path
         tok_path = getattr(settings, "nlp_tokenizer_path", None)
         if not model_path or not tok_path:
             return None
@@ -34,7 +94,11 @@ class NLPModel:
         except Exception:
             return None
         try:
-            sess = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])  # type: ignore
+            so = ort.SessionOptions()  # type: ignore
+            so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL  # type: ignore
+            # Concurrency comes from the event loop/worker pool; keep each run on one core
+            so.intra_op_num_threads = max(1, int(getattr(settings, "nlp_intra_op_threads", 1) or 1))
+            sess = ort.InferenceSession(model_path, sess_options=so, providers=["CPUExecutionProvider"])  # type: ignore
             tok = Tokenizer.from_file(tok_path)  # type: ignore
             return NLPModel(sess, tok, _DEFAULT_LABELS)
         except Exception:
@@ -43,42 +107,17 @@ class NLPModel:
     # ---------- public API ----------
     def predict_intent(self, text: str) -> Tuple[str, float]:
         # Zero‑shot over our label set using MNLI: score entailment for each label hypothesis.
-        labels = [
-            ("show_photo", [
-                "The user asks to show a cat photo.",
-                "The user requests a photo of a cat.",
-                "They want TomCat to send a cat picture.",
-            ]),
-            ("who_is", [
-                "The user asks who a specific cat is.",
-                "They want cat information or a profile.",
-            ]),
-            ("cv_identify", [
-                "The user asks to identify a cat in a photo.",
-                "They ask to classify the cat in the image.",
-            ]),
-            ("feed_update", [
-                "The user says a feeding occurred or bowl was filled.",
-            ]),
-            ("sub_request", [
-                "The user asks someone to cover a feeding shift.",
-            ]),
-            ("sub_accept", [
-                "The user volunteers to cover a feeding shift.",
-            ]),
-        ]
+        probs = self._mnli_entailment_probs(text, [hyp for _, hyp in _INTENT_HYPOTHESES])
         best_label = "none"; best_p = 0.0
-        for label, hyps in labels:
-            for hyp in hyps:
-                p = self._mnli_entailment_prob(text, hyp)
-                best_label, best_p = (label, p) if p > best_p else (best_label, best_p)
+        for (label, _), p in zip(_INTENT_HYPOTHESES, probs):
+            if p > best_p:
+                best_label, best_p = label, p
         return best_label, float(best_p)
 
     def score_entity(self, text: str, vocab: List[str]) -> Tuple[str, float]:
         best = ""; best_p = 0.0
-        for cand in vocab:
-            hyp = f"The message is about {cand}."
-            p = self._mnli_entailment_prob(text, hyp)
+        probs = self._mnli_entailment_probs(text, [f"The message is about {cand}." for cand in vocab])
+        for cand, p in zip(vocab, probs):
             if p > best_p:
                 best, best_p = cand, p
         return best, float(best_p)
@@ -89,6 +128,41 @@ class NLPModel:
         return float(self._mnli_entailment_prob(text, hyp))
 
     # ---------- helpers ----------
+    def _mnli_entailment_probs(self, premise: str, hypotheses: List[str]) -> List[float]:
+        """Score every (premise, hypothesis) pair in one padded ORT run.
+        Falls back to one run per pair if the batch can't be built or the model rejects it.
+        """
+        if not hypotheses:
+            return []
+        try:
+            import numpy as np  # type: ignore
+            encs = self.tokenizer.encode_batch([(premise, h) for h in hypotheses])  # type: ignore
+            n = len(encs)
+            width = max(len(e.ids) for e in encs)
+            if width > _BATCH_MAX_TOKENS:
+                raise ValueError("batch too wide")
+            pad_id = int((getattr(self.tokenizer, "padding", None) or {}).get("pad_id", 0))
+            ids = np.full((n, width), pad_id, dtype=np.int64)
+            attn = np.zeros((n, width), dtype=np.int64)
+            for row, e in enumerate(encs):
+                ids[row, :len(e.ids)] = e.ids
+                attn[row, :len(e.ids)] = e.attention_mask  # respects padding baked into tokenizer.json
+            ort_inputs: Dict[str, Any] = {}
+            if self._ids_name:
+                ort_inputs[self._ids_name] = ids
+            if self._attn_name:
+                ort_inputs[self._attn_name] = attn
+            if self._tok_types_name:
+                ort_inputs[self._tok_types_name] = np.zeros((n, width), dtype=np.int64)
+            logits = self._logits(self.session.run(None, ort_inputs))
+            if logits is None or tuple(logits.shape) != (n, 3):
+                raise ValueError("no (n, 3) logits output")
+            # Row-wise softmax over [contradiction, neutral, entailment]
+            e = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return [float(p) for p in e[:, -1] / e.sum(axis=1)]
+        except Exception:
+            return [self._mnli_entailment_prob(premise, h) for h in hypotheses]
+
     def _mnli_entailment_prob(self, premise: str, hypothesis: str) -> float:
         try:
             enc = self.tokenizer.encode(premise, hypothesis)  # type: ignore
@@ -96,27 +170,26 @@ class NLPModel:
             attn = enc.attention_mask if hasattr(enc, "attention_mask") else [1] * len(ids)
             import numpy as np  # type: ignore
             ort_inputs: Dict[str, Any] = {}
-            for name in [i.name for i in self.session.get_inputs()]:
-                if name.lower().endswith("input_ids"):
-                    ort_inputs[name] = np.array([ids], dtype=np.int64)
-                elif name.lower().endswith("attention_mask"):
-                    ort_inputs[name] = np.array([attn], dtype=np.int64)
-                elif name.lower().endswith("token_type_ids"):
-                    ort_inputs[name] = np.zeros((1, len(ids)), dtype=np.int64)
-            outputs = self.session.run(None, ort_inputs)
-            logits = None
-            for out in outputs:
-                if getattr(out, "shape", None) is not None and len(out.shape) == 2 and out.shape[1] in (3,):
-                    logits = out
-                    break
+            if self._ids_name:
+                ort_inputs[self._ids_name] = np.array([ids], dtype=np.int64)
+            if self._attn_name:
+                ort_inputs[self._attn_name] = np.array([attn], dtype=np.int64)
+            if self._tok_types_name:
+                ort_inputs[self._tok_types_name] = np.zeros((1, len(ids)), dtype=np.int64)
+            logits = self._logits(self.session.run(None, ort_inputs))
             if logits is None:
                 return 0.0
             # Softmax over 3-way MNLI: [contradiction, neutral, entailment]
             x = logits[0]
-            m = float(np.max(x))
-            exps = np.exp(x - m)
-            probs = exps / float(np.sum(exps))
-            entail_p = float(probs[-1])
-            return entail_p
+            e = np.exp(x - x.max())
+            return float(e[-1] / e.sum())
         except Exception:
             return 0.0
+
+    def _logits(self, outputs):
+        if self._logits_idx is not None:
+            return outputs[self._logits_idx]
+        for out in outputs:
+            if getattr(out, "shape", None) is not None and len(out.shape) == 2 and out.shape[1] == 3:
+                return out
+        return None
@@ -0,0 +1,20 @@
+"""Process-wide runtime resources shared by main.py and the handlers/services.
+
+Kept in its own module so services can use it without importing main.py.
+"""
+from __future__ import annotations
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# One bounded pool for every synchronous call that would otherwise stall the
+# gateway: gspread HTTP, log file writes, Gmail calls.
+BLOCKING_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tomcat-io")
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn(*args, **kwargs) on BLOCKING_POOL and await the result."""
+    return await asyncio.get_running_loop().run_in_executor(BLOCKING_POOL, functools.partial(fn, *args, **kwargs))
@@ -7,15 +7,156 @@ Expected headers (by column index) inspired by your current sheet:
 """
 from __future__ import annotations
 from typing import Any
+from collections import OrderedDict
+import asyncio
 import datetime as dt
-from .sheets_client import sheets_client
+import random
+import time
+from .sheets_client import open_spreadsheet, open_worksheet, clear_open_cache
 from ..config import settings
+from ..runtime import run_blocking
+from ..utils.text import norm_alnum_lower
+
 try:
-    from ..utils.text import norm_alnum_lower  # real helper if you have utils/
-except Exception:
-    import re as _re
-    def norm_alnum_lower(s: str) -> str:
-        return _re.sub(r"[^a-z0-9]+", "", (s or "").lower())
+    import numpy as np  # type: ignore
+except Exception:  # numpy is in requirements, but keep lookups working without it
+    np = None
+
+def _fetch_rows(sheet_id: str, tab: str) -> list[list[str]]:
+    # Blocking gspread round-trips (spreadsheet metadata + values); call via run_blocking
+    return open_worksheet(sheet_id, tab).get_all_values()
+
+# (sheet_id, tab) -> (expires_at, rows); LRU-ordered, oldest first
+_ROWS_TTL = 300.0
+_ROWS_MAX = 16
+_rows_cache: "OrderedDict[tuple[str, str], tuple[float, list[list[str]]]]" = OrderedDict()
+
+async def _load_rows(sheet_id: str, tab: str) -> list[list[str]]:
+    """All values of a worksheet, re-fetched at most every _ROWS_TTL seconds."""
+    key = (sheet_id, tab)
+    hit = _rows_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        _rows_cache.move_to_end(key)
+        return hit[1]
+    rows = await run_blocking(_fetch_rows, sheet_id, tab)
+    _store_rows(sheet_id, tab, rows)
+    return rows
+
+def _store_rows(sheet_id: str, tab: str, rows: list[list[str]]) -> None:
+    _rows_cache[(sheet_id, tab)] = (time.monotonic() + _ROWS_TTL, rows)
+    _rows_cache.move_to_end((sheet_id, tab))
+    while len(_rows_cache) > _ROWS_MAX:
+        _rows_cache.popitem(last=False)
+
+def _rows_fresh(sheet_id: str, tab: str) -> bool:
+    hit = _rows_cache.get((sheet_id, tab))
+    return hit is not None and hit[0] > time.monotonic()
+
+def _fetch_tabs_batch(sheet_id: str, tabs: list[str]) -> list[list[list[str]]]:
+    # One values.batchGet round-trip for several whole tabs of the same spreadsheet
+    res = open_spreadsheet(sheet_id).values_batch_get([f"'{t}'" for t in tabs])
+    return [vr.get("values", []) for vr in (res.get("valueRanges") or [])]
+
+async def fetch_catabase_and_recentpics() -> None:
+    """Warm CatDatabase + RecentPics for a profile embed in as few round-trips as possible.
+    Same spreadsheet: a single batchGet. Different spreadsheets: both fetches run concurrently.
+    """
+    cat_id, pics_id = settings.sheet_catabase_id, settings.sheet_vision_id
+    need_cat = bool(cat_id) and not _rows_fresh(cat_id, "CatDatabase")
+    need_pics = bool(pics_id) and not _rows_fresh(pics_id, "RecentPics")
+    if need_cat and need_pics and cat_id == pics_id:
+        cat_rows, pics_rows = await run_blocking(_fetch_tabs_batch, cat_id, ["CatDatabase", "RecentPics"])
+        _store_rows(cat_id, "CatDatabase", cat_rows)
+        _store_rows(pics_id, "RecentPics", pics_rows)
+    elif need_cat and need_pics:
+        await asyncio.gather(_load_rows(cat_id, "CatDatabase"), _load_rows(pics_id, "RecentPics"))
+
+# CatDatabase lookup index, rebuilt only when _load_rows hands back a new rows list:
+# (rows, {normalized key: row}). Keys are each row's full name ("67microwave") plus its
+# digit-stripped alias ("microwave"); full names win when an alias collides with one.
+_cat_index: tuple[list, dict[str, list[str]]] | None = None
+
+def _cat_lookup_index(rows: list[list[str]]) -> dict[str, list[str]]:
+    global _cat_index
+    if _cat_index is not None and _cat_index[0] is rows:
+        return _cat_index[1]
+    idx: dict[str, list[str]] = {}
+    aliases: list[tuple[str, list[str]]] = []
+    for r in rows[1:]:
+        full_name = (r[0] if r else "") or ""
+        k = norm_alnum_lower(full_name)
+        if k and k not in idx:
+            idx[k] = r
+        # Alias: without leading digits and punctuation ("67. Microwave" -> "microwave")
+        if full_name[:1].isdigit():
+            aliases.append((norm_alnum_lower(full_name.lstrip("0123456789. \t")), r))
+    for alias, r in aliases:
+        if alias:
+            idx.setdefault(alias, r)
+    _cat_index = (rows, idx)
+    return idx
+
+# RecentPics lookup: (rows, {normalized full name: _PicsEntry}). Each entry is the
+# matching row with the highest TOTAL, already split into parallel arrays of its
+# usable photos so lookups never walk the ragged URL/SERIAL columns again.
+#   urls:    non-empty URLs, sheet order (oldest → newest)
+#   labels:  serial text per URL ("Unknown" if blank)
+#   serials: serial per URL as int32 (-1 if blank / not a number)
+#   total:   TOTAL column
+#   newest:  position of the first highest serial, found once here rather than
+#            assuming the sheet is written in serial order; -1 if no serial is usable
+_PicsEntry = tuple[list[str], list[str], Any, int, int]
+_pics_index: tuple[list, dict[str, _PicsEntry]] | None = None
+
+def _row_total(r: list[str]) -> int:
+    return int(r[2] or 0) if len(r) > 2 and str(r[2]).isdigit() else 0
+
+def _pack_pics_row(r: list[str]) -> _PicsEntry:
+    urls: list[str] = []
+    labels: list[str] = []
+    serials: list[int] = []
+    # URL/SERIAL pairs start at col 3: URLs on odd columns, serials right after each
+    for i in range(3, len(r), 2):
+        u = (r[i] or "").strip()
+        if not u:
+            continue
+        sv = (r[i + 1] or "").strip() if i + 1 < len(r) else ""
+        urls.append(u)
+        labels.append(sv or "Unknown")
+        try:
+            serials.append(int(sv) if sv else -1)
+        except Exception:
+            serials.append(-1)
+    if np is not None:
+        packed = np.asarray(serials, dtype=np.int32)
+        newest = int(packed.argmax()) if len(serials) and packed.max() >= 0 else -1
+    else:
+        packed = serials
+        newest = max(range(len(serials)), key=serials.__getitem__) if serials and max(serials) >= 0 else -1
+    return (urls, labels, packed, _row_total(r), newest)
+
+def _pics_lookup_index(rows: list[list[str]]) -> dict[str, _PicsEntry]:
+    global _pics_index
+    if _pics_index is not None and _pics_index[0] is rows:
+        return _pics_index[1]
+    best: dict[str, list[str]] = {}
+    for r in rows[1:]:
+        k = norm_alnum_lower(r[0] if r else "")
+        cur = best.get(k)
+        # first row with the max TOTAL wins, as max() over the matches did
+        if cur is None or _row_total(r) > _row_total(cur):
+            best[k] = r
+    by_name = {k: _pack_pics_row(r) for k, r in best.items()}
+    _pics_index = (rows, by_name)
+    return by_name
+
+def refresh() -> None:
+    """Drop cached sheet rows and indexes; the next lookup re-reads the sheets."""
+    global _cat_index, _pics_index
+    _rows_cache.clear()
+    clear_open_cache()
+    _cat_index = None
+    _pics_index = None
 
 IDX = {
     "full_name": 0,
@@ -40,30 +181,16 @@ async def get_cat_profile(query: str) -> dict | str:
     """Return a dict for a cat profile or a string error message."""
     if not settings.sheet_catabase_id:
         return "Catabase sheet ID not configured. Set SHEET_CATABASE_ID in .env."
-    gc = sheets_client()
-    ws = gc.open_by_key(settings.sheet_catabase_id).worksheet("CatDatabase")
-
-    rows = ws.get_all_values()
+    rows = await _load_rows(settings.sheet_catabase_id, "CatDatabase")
     if not rows:
         return "Catabase is empty."
 
-    # Build lookup by normalized key: "67. Microwave" → "67microwave" etc
-    header, *data = rows
-    best_row = None
+    # Lookup by normalized key: "67. Microwave" → "67microwave" etc
     key = norm_alnum_lower(query)
     if not key:
         return "Empty query."
 
-    for r in data:
-        full_name = (r[IDX["full_name"]] if len(r) > IDX["full_name"] else "") or ""
-        if norm_alnum_lower(full_name) == key:
-            best_row = r
-            break
-        # Fallback: try without leading digits and punctuation
-        name_only = "".join(ch for ch in full_name if not ch.isdigit()).lstrip(". ").strip()
-        if norm_alnum_lower(name_only) == key:
-            best_row = r
-            break
+    best_row = _cat_lookup_index(rows).get(key)
 
     if not best_row:
         return f"No match for '{query}'."
@@ -102,41 +229,25 @@ async def get_recent_photo(full_name: str) -> dict | str:
     """Pick one recent photo for a given FULL_NAME from RecentPics tab."""
     if not settings.sheet_vision_id:
         return "Aux sheet ID not configured. Set SHEET_VISION_ID in .env."
-    gc = sheets_client()
-    ws = gc.open_by_key(settings.sheet_vision_id).worksheet("RecentPics")
-
-    rows = ws.get_all_values()
+    rows = await _load_rows(settings.sheet_vision_id, "RecentPics")
     key = norm_alnum_lower(full_name)
     if not rows or not key:
         return "No data."
 
-    header, *data = rows
-    matches = [r for r in data if norm_alnum_lower(r[0] if r else "") == key]
-    if not matches:
+    entry = _pics_lookup_index(rows).get(key)
+    if not entry:
         return f"No recent photos for '{full_name}'."
 
-    pick = max(matches, key=lambda r: int(r[2] or 0) if len(r) > 2 and str(r[2]).isdigit() else 0)
-    total_available = int(pick[2] or 0) if len(pick) > 2 and str(pick[2]).isdigit() else 0
-
-    # Collect URL/SERIAL pairs starting at col 3
-    pairs: list[tuple[str, str]] = []
-    i = 3
-    while i < len(pick):
-        url = pick[i].strip() if i < len(pick) else ""
-        serial = pick[i + 1].strip() if i + 1 < len(pick) else ""
-        if url:
-            pairs.append((url, serial or "Unknown"))
-        i += 2
-    if not pairs:
+    urls, labels, _, total_available, _ = entry
+    if not urls:
         return f"No accessible photos found for {full_name}."
 
-    import random
-    url, serial = random.choice(pairs)
-    reverse_index = max(total_available - pairs.index((url, serial)), 1)
+    n = random.randrange(len(urls))  # position among usable photos
+    reverse_index = max(total_available - n, 1)
     return {
         "actual_name": full_name,
-        "url": url,
-        "serial": serial,
+        "url": urls[n],
+        "serial": labels[n],
         "total_available": total_available,
         "reverse_index": reverse_index,
     }
@@ -145,45 +256,24 @@ async def get_most_recent_photo(full_name: str) -> dict | str:
     """Return the most recent photo for a FULL_NAME using the highest SERIAL value."""
     if not settings.sheet_vision_id:
         return "Aux sheet ID not configured. Set SHEET_VISION_ID in .env."
-    gc = sheets_client()
-    ws = gc.open_by_key(settings.sheet_vision_id).worksheet("RecentPics")
-
-    rows = ws.get_all_values()
+    rows = await _load_rows(settings.sheet_vision_id, "RecentPics")
     key = norm_alnum_lower(full_name)
     if not rows or not key:
         return "No data."
 
-    header, *data = rows
-    matches = [r for r in data if norm_alnum_lower(r[0] if r else "") == key]
-    if not matches:
+    entry = _pics_lookup_index(rows).get(key)
+    if not entry:
         return f"No recent photos for '{full_name}'."
 
-    # Choose the row with max TOTAL (col 2) first, then pick the highest SERIAL among URL/SERIAL pairs
-    pick = max(matches, key=lambda r: int(r[2] or 0) if len(r) > 2 and str(r[2]).isdigit() else 0)
-    best = None
-    best_serial = -1
-    i = 3
-    while i < len(pick):
-        url = pick[i].strip() if i < len(pick) else ""
-        serial = pick[i + 1].strip() if i + 1 < len(pick) else ""
-        try:
-            s_val = int(serial) if serial else -1
-        except Exception:
-            s_val = -1
-        if url and s_val > best_serial:
-            best_serial = s_val
-            best = (url, serial or "Unknown")
-        i += 2
-
-    if not best:
+    # Row with max TOTAL and its highest-SERIAL photo were both chosen at index time
+    urls, labels, _, total_available, j = entry
+    if not urls or j < 0:
         return f"No accessible photos found for {full_name}."
 
-    url, serial = best
-    total_available = int(pick[2] or 0) if len(pick) > 2 and str(pick[2]).isdigit() else 0
     return {
         "actual_name": full_name,
-        "url": url,
-        "serial": serial,
+        "url": urls[j],
+        "serial": labels[j],
         "total_available": total_available,
     }
 
@@ -195,6 +285,10 @@ async def build_profile_embed(query: str) -> dict | str:
     Returns a dict compatible with discord.Embed.from_dict or a string error.
     Uses CatDatabase for metadata and RecentPics for a nice image if available.
     """
+    try:
+        await fetch_catabase_and_recentpics()
+    except Exception:
+        pass  # lookups below fall back to fetching each tab themselves
     prof = await get_cat_profile(query)
     if isinstance(prof, str):
         return prof  # error string from get_cat_profile
@@ -2,7 +2,10 @@
 Share your sheets with the service account email.
 """
 from __future__ import annotations
+from functools import lru_cache
 from gspread.auth import service_account
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..config import settings  # package-local config
 
 _SCOPES = [
@@ -12,10 +15,41 @@ _SCOPES = [
 
 _client = None
 
+def _pooled_adapter() -> HTTPAdapter:
+    # Keep-alive pool sized for the blocking pool's workers; retry transient errors on
+    # idempotent requests only (urllib3 default), so appends are never replayed. Once retries
+    # run out the last response is returned, so gspread still raises its usual APIError
+    return HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False
+        ),
+    )
+
 def sheets_client():
     global _client
     if _client:
         return _client
     path = getattr(settings, "google_service_account_json", None) or getattr(settings, "google_sa_json", "credentials/service_account.json")
-    _client = service_account(filename=path, scopes=_SCOPES)
-    return _client
\ No newline at end of file
+    client = service_account(filename=path, scopes=_SCOPES)
+    session = getattr(getattr(client, "http_client", None), "session", None)
+    if session is not None:
+        session.mount("https://", _pooled_adapter())
+    _client = client
+    return _client
+
+@lru_cache(maxsize=8)
+def open_spreadsheet(sheet_id: str):
+    """Spreadsheet handle by key; metadata is fetched once per id, not per lookup."""
+    return sheets_client().open_by_key(sheet_id)
+
+@lru_cache(maxsize=32)
+def open_worksheet(sheet_id: str, title: str):
+    """Worksheet handle by (spreadsheet key, tab title); gspread re-fetches metadata on every .worksheet()."""
+    return open_spreadsheet(sheet_id).worksheet(title)
+
+def clear_open_cache() -> None:
+    """Forget cached handles, e.g. after tabs are renamed or recreated."""
+    open_worksheet.cache_clear()
+    open_spreadsheet.cache_clear()
@@ -1,4 +1,5 @@
 import re
+import threading
 from typing import Optional
 
 SPAM_PATTERNS = [
@@ -8,31 +9,70 @@ SPAM_PATTERNS = [
     re.compile(r"first\s*come\s*first\s*serve", re.I),
     re.compile(r"\bmail\s+me\b|\bemail\s+me\b", re.I),
 ]
+# Single union of SPAM_PATTERNS: one scan instead of one per rule, used by check_spam
+# (the on_message path) and is_spam via _matched_rules. Group r<i> is SPAM_PATTERNS[i];
+# the list itself stays for introspection.
+_SPAM_ANY = re.compile("|".join(f"(?P<r{i}>{rx.pattern})" for i, rx in enumerate(SPAM_PATTERNS)), re.I)
 
 EMAIL_RE = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.I)
 PHONE_RE = re.compile(r"\+?1?\s*(?:\(\d{3}\)|\d{3})[\s.-]?\d{3}[\s.-]?\d{4}")
 
+# Every rule above needs one of these literals ('@' for email, 3 digits for phone,
+# a keyword per SPAM_PATTERNS entry); keep in sync when adding patterns.
+_CHEAP_PREFILTER = re.compile(r"@|\d{3}|free|ticket|interested|first|mail", re.I)
+_MIN_SPAM_LEN = 6  # shortest possible hit is an email like "a@b.co"
+
+# Lowercase; check_spam matches them against the message lowered once
+FUZZY_PHRASES = (
+    "tickets available", "4 tickets", "american airlines center",
+    "dm me if interested", "message me if interested", "first come first serve",
+    "free macbook", "giving out my macbook", "free iphone","at&t stadium", "ps5 charger",
+)
+# Exact occurrences of every phrase in one scan. The lookahead matches at each start
+# position, so overlapping phrases ("4 tickets available") are all reported.
+_PHRASES_EXACT = re.compile(
+    "(?=(" + "|".join(re.escape(p) for p in sorted(FUZZY_PHRASES, key=len, reverse=True)) + "))"
+)
+
+def _matched_rules(text: str) -> list[str]:
+    """Distinct SPAM_PATTERNS groups (r<i>) hit in text, in first-seen order.
+    Callers apply the _CHEAP_PREFILTER/_MIN_SPAM_LEN guard first."""
+    return list(dict.fromkeys(m.lastgroup for m in _SPAM_ANY.finditer(text)))
+
+def _exact_phrases(text_low: str) -> set[str]:
+    return {m.group(1) for m in _PHRASES_EXACT.finditer(text_low)}
+
+# Both arguments must already be lowercase
 try:
     from rapidfuzz import fuzz as rf_fuzz
-    def _fuzzy_hit(text: str, phrase: str, thresh: int=88) -> bool:
+    _HAVE_RAPIDFUZZ = True
+    def _fuzzy_hit(text_low: str, phrase_low: str, thresh: int=88) -> bool:
         try:
-            return rf_fuzz.partial_ratio(text.lower(), phrase.lower()) >= thresh
+            return rf_fuzz.partial_ratio(text_low, phrase_low) >= thresh
         except Exception:
             return False
 except Exception:
-    def _fuzzy_hit(text: str, phrase: str, thresh: int=88) -> bool:
-        return phrase.lower() in (text or "").lower()
+    _HAVE_RAPIDFUZZ = False  # exact phrase hits still count; see check_spam
 
 _nlp_cached = None
+# Startup warms the model on a worker thread; the lock keeps a second caller from loading it twice
+_nlp_load_lock = threading.Lock()
 
-def _nlp_predict_spam(settings, text: str) -> float:
+def _warm_nlp(settings):
+    """Load the spam NLP model once (startup calls this off the event loop)."""
     global _nlp_cached
     if _nlp_cached is None:
-        try:
-            from .nlp.model import NLPModel
-            _nlp_cached = NLPModel.maybe_load(settings)
-        except Exception:
-            _nlp_cached = False
+        with _nlp_load_lock:
+            if _nlp_cached is None:
+                try:
+                    from .nlp.model import NLPModel
+                    _nlp_cached = NLPModel.maybe_load(settings)
+                except Exception:
+                    _nlp_cached = False
+    return _nlp_cached
+
+def _nlp_predict_spam(settings, text: str) -> float:
+    # Never load from the per-message path: until _warm_nlp finishes, rules decide alone
     if not _nlp_cached:
         return 0.0
     try:
@@ -53,10 +93,14 @@ def _is_trusted_member(message, settings) -> Optional[str]:
             if age_days >= int(getattr(settings, 'spam_min_account_days', 30) or 30):
                 return "trusted_age"
         # Trusted roles
-        trusted_list = [s.lower() for s in (getattr(settings, 'trusted_role_names', []) or [])]
-        for r in getattr(member, 'roles', []) or []:
-            rname = str(getattr(r, 'name', '')).lower()
-            if any(t in rname for t in trusted_list):
+        trusted = getattr(settings, 'trusted_role_set', None) or frozenset(
+            s.lower() for s in (getattr(settings, 'trusted_role_names', []) or []))
+        if trusted:
+            rnames = {str(getattr(r, 'name', '')).lower() for r in (getattr(member, 'roles', []) or [])}
+            if not rnames.isdisjoint(trusted):
+                return "trusted_role"
+            # Still a contains match ("due paying members 2025"), checked only after the exact miss
+            if any(t in rn for rn in rnames for t in trusted):
                 return "trusted_role"
         return None
     except Exception:
@@ -69,31 +113,31 @@ def check_spam(message, settings) -> tuple[bool, str]:
     trust = _is_trusted_member(message, settings)
     if trust:
         return (False, trust)
+    # Contact info and SPAM_PATTERNS all need a prefilter literal; most chat has none,
+    # so those scans are skipped. Phrases and NLP below still see every message.
+    rules_possible = len(text) >= _MIN_SPAM_LEN and _CHEAP_PREFILTER.search(text) is not None
     # Strong indicators
-    if EMAIL_RE.search(text) or PHONE_RE.search(text):
+    if rules_possible and (EMAIL_RE.search(text) or PHONE_RE.search(text)):
         # allow one weak signal to pass but with contact info treat as strong
         pass_score = 1
     else:
         pass_score = 0
     score = pass_score
-    matched_rules = []
-    for rx in SPAM_PATTERNS:
-        if rx.search(text):
-            score += 2
-            matched_rules.append(rx.pattern)
-    # fuzzy phrases
-    fuzzy_phrases = [
-        "tickets available", "4 tickets", "american airlines center",
-        "dm me if interested", "message me if interested", "first come first serve",
-        "free macbook", "giving out my macbook", "free iphone","at&t stadium", "ps5 charger",
-    ]
+    # Any rule hit already puts score at the spam threshold, so counting each distinct
+    # rule seen in one pass matches the old per-pattern loop's decision
+    if rules_possible:
+        score += 2 * len(_matched_rules(text))
+    # fuzzy phrases: exact substrings come from one scan (an exact hit is partial_ratio 100);
+    # rapidfuzz only runs for phrases that didn't appear verbatim
+    text_low = text.lower()
+    exact = _exact_phrases(text_low)
     fuzzy_hits = []
-    for ph in fuzzy_phrases:
-        if _fuzzy_hit(text, ph, 86):
+    for ph in FUZZY_PHRASES:
+        if ph in exact or (_HAVE_RAPIDFUZZ and _fuzzy_hit(text_low, ph, 86)):
             score += 1
             fuzzy_hits.append(ph)
-    # NLP backstop
-    spam_prob = _nlp_predict_spam(settings, text)
+    # NLP backstop, only when the rules haven't already decided (it's the costly part)
+    spam_prob = _nlp_predict_spam(settings, text) if score < 2 else 0.0
     if spam_prob >= float(getattr(settings, 'spam_nlp_conf', 0.9)):
         score += 2
     if score >= 2:
@@ -105,8 +149,8 @@ def check_spam(message, settings) -> tuple[bool, str]:
 
 def is_spam(text: str) -> bool:
     # Legacy check for any callers using plain text
-    if not text:
+    if not text or len(text) < _MIN_SPAM_LEN or not _CHEAP_PREFILTER.search(text):
         return False
     if EMAIL_RE.search(text) or PHONE_RE.search(text):
         return True
-    return any(p.search(text or "") for p in SPAM_PATTERNS)
+    return bool(_matched_rules(text))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+import re
+from functools import lru_cache
+
+# ASCII fast path for norm_alnum_lower: one str.translate pass that lowercases A-Z
+# and deletes every other non-alphanumeric ASCII character.
+_ALNUM = set(range(48, 58)) | set(range(65, 91)) | set(range(97, 123))
+_ASCII_TBL = str.maketrans(
+    {**{c: None for c in range(128) if c not in _ALNUM}, **{c: c + 32 for c in range(65, 91)}}
+)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=4096)
+def norm_alnum_lower(s: str) -> str:
+    """Lowercase and keep only [a-z0-9]: "67. Microwave" -> "67microwave"."""
+    if not s:
+        return ""
+    if s.isascii():
+        return s.translate(_ASCII_TBL)
+    # Non-ASCII (accents, emoji, smart quotes): lower() first, then drop anything outside a-z0-9
+    return _NON_ALNUM.sub("", s.lower())
@@ -0,0 +1,50 @@
+# tomcat/vision/_boxops.py
+"""Batched box math for vision.py. Numba-compiled when numba is installed, NumPy otherwise."""
+from __future__ import annotations
+import math
+from typing import Any
+
+import numpy as np
+
+try:
+    from numba import njit, prange  # type: ignore
+except Exception:
+    njit = None  # type: ignore[assignment]
+
+
+def _expand_boxes_np(xyxy: Any, pad_pct: float, w: int, h: int) -> Any:
+    pad = np.tile((xyxy[:, 2:] - xyxy[:, :2]) * pad_pct, 2)
+    lo = np.floor(xyxy[:, :2] - pad[:, :2])
+    hi = np.ceil(xyxy[:, 2:] + pad[:, 2:])
+    out = np.concatenate([np.maximum(lo, 0), np.minimum(hi, [w, h])], axis=1)
+    return out.astype(np.int64)
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _expand_boxes_nb(xyxy, pad_pct, w, h):  # pragma: no cover - compiled
+        n = xyxy.shape[0]
+        out = np.empty((n, 4), dtype=np.int64)
+        for i in prange(n):
+            x1, y1, x2, y2 = xyxy[i, 0], xyxy[i, 1], xyxy[i, 2], xyxy[i, 3]
+            pad_x = (x2 - x1) * pad_pct
+            pad_y = (y2 - y1) * pad_pct
+            out[i, 0] = max(0, int(math.floor(x1 - pad_x)))
+            out[i, 1] = max(0, int(math.floor(y1 - pad_y)))
+            out[i, 2] = min(w, int(math.ceil(x2 + pad_x)))
+            out[i, 3] = min(h, int(math.ceil(y2 + pad_y)))
+        return out
+else:
+    _expand_boxes_nb = None
+
+
+def expand_boxes(xyxy: Any, pad_pct: float, w: int, h: int) -> Any:
+    """Pad each (x1, y1, x2, y2) by pad_pct of its size and clip to the image;
+    (N, 4) floats in, (N, 4) int64 out."""
+    arr = np.ascontiguousarray(np.asarray(xyxy, dtype=np.float64).reshape(-1, 4))
+    if _expand_boxes_nb is not None and len(arr):
+        try:
+            return _expand_boxes_nb(arr, float(pad_pct), int(w), int(h))
+        except Exception:
+            pass  # compile failure: NumPy path below
+    return _expand_boxes_np(arr, pad_pct, w, h)
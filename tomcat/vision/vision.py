@@ -2,10 +2,13 @@
 from __future__ import annotations
 import io
 import os
-import math
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Any, cast
+from typing import List, Tuple, Optional, Any
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import torch
 from torch import Tensor
@@ -16,8 +19,33 @@ try:
 except Exception:
     YOLO = None  # type: ignore[assignment]
 
+# libjpeg-turbo's SIMD encoder when PyTurboJPEG (and the native lib) is available; Pillow otherwise
+try:
+    import turbojpeg as _turbojpeg  # type: ignore
+except Exception:
+    _turbojpeg = None  # type: ignore[assignment]
+_tj: Optional[Any] = None
+if _turbojpeg is not None:
+    try:
+        _tj = _turbojpeg.TurboJPEG()
+    except Exception:
+        _tj = None  # native libturbojpeg missing
+
+# libjpeg-turbo enum values, looked up so a name one PyTurboJPEG release lacks can't
+# disable the library. TJFLAG_OPTIMIZE isn't exported by 1.x or 2.x; 0 means "not available".
+TJPF_RGB = getattr(_turbojpeg, "TJPF_RGB", 0)
+TJSAMP_444 = getattr(_turbojpeg, "TJSAMP_444", 0)
+TJSAMP_422 = getattr(_turbojpeg, "TJSAMP_422", 1)
+TJSAMP_420 = getattr(_turbojpeg, "TJSAMP_420", 2)
+TJSAMP_GRAY = getattr(_turbojpeg, "TJSAMP_GRAY", 3)
+TJSAMP_440 = getattr(_turbojpeg, "TJSAMP_440", 4)
+TJCS_YCbCr = getattr(_turbojpeg, "TJCS_YCbCr", 1)
+TJCS_GRAY = getattr(_turbojpeg, "TJCS_GRAY", 2)
+TJFLAG_OPTIMIZE = getattr(_turbojpeg, "TJFLAG_OPTIMIZE", 0)
+
 from ..config import settings
 from ..logger import log_action
+from ._boxops import expand_boxes
 
 # ---------- Constants aligned to v5.6 ----------
 _PURPLE = "#4C007F"
@@ -25,9 +53,10 @@ _DEFAULT_CONF = 0.552  # your max-F1
 
 # ---------- Internal state (typed loosely to keep Pylance calm) ----------
 _yolo: Optional[Any] = None
-_clf: Optional[torch.nn.Module] = None
+_clf: Optional[Any] = None  # torch.nn.Module, or _OrtClassifier on the INT8 CPU path
 _device: Optional[torch.device] = None
 _half: bool = False
+_amp_dtype: torch.dtype = torch.float16  # classifier autocast dtype; bf16 on Ampere+
 
 _font: Optional[Any] = None  # FreeTypeFont vs ImageFont stubs vary; keep it Any
 
@@ -53,21 +82,78 @@ def _load_font() -> Any:
 
 
 def _ensure_device_only() -> None:
-    global _device, _half
+    global _device, _half, _amp_dtype
     if _device is None:
         _device = _pick_device()
         _half = bool(settings.cv_half) and _device.type == "cuda"
+        # bf16 has fp32's exponent range (no overflow in logits/BN) at the same tensor-core speed
+        try:
+            # is_bf16_supported() is also True when bf16 is only emulated (e.g. T4), so gate on sm_80+
+            if _half and torch.cuda.get_device_capability(_device)[0] >= 8:
+                _amp_dtype = torch.bfloat16
+        except Exception:
+            pass
+
+def _exported_detector(weights: str) -> Optional[str]:
+    """Path to a TensorRT engine (CUDA) or OpenVINO model dir (CPU) built from weights.
+    Exported once and cached next to the .pt, keyed by device, precision and imgsz, and
+    rebuilt when the .pt is newer than the export; None if export fails."""
+    assert _device is not None
+    imgsz = int(settings.cv_detect_imgsz)
+    stem = os.path.splitext(weights)[0]
+    prec = "fp16" if _half else "fp32"
+    if _device.type == "cuda":
+        fmt, cached = "engine", f"{stem}.{_device.type}.{prec}.{imgsz}.engine"
+    elif _device.type == "cpu":
+        fmt, cached = "openvino", f"{stem}.{_device.type}.{prec}.{imgsz}_openvino_model"
+    else:
+        return None  # mps: no exported backend worth using
+    if os.path.exists(cached):
+        if os.path.getmtime(cached) >= os.path.getmtime(weights):
+            return cached
+        # weights replaced since the export: drop it so os.replace below can't collide
+        if os.path.isdir(cached):
+            shutil.rmtree(cached)
+        else:
+            os.remove(cached)
+    try:
+        y: Any = YOLO(weights)  # type: ignore[call-arg, misc]
+        out = y.export(format=fmt, imgsz=imgsz, half=bool(_half), dynamic=False, batch=1, verbose=False)
+        os.replace(str(out), cached)
+        log_action("viz_detect_export", f"format={fmt}", cached)
+        return cached
+    except Exception as e:
+        log_action("viz_detect_export_error", f"format={fmt}", str(e))
+        return None
+
+# detect/crop/identify run on worker threads; without this two first calls would both
+# export (TensorRT builds take minutes) and race on the same output files
+_detector_lock = threading.Lock()
+
 
 def _ensure_detector() -> None:
-    global _yolo
     _ensure_device_only()
     if _yolo is not None:
         return
+    with _detector_lock:
+        if _yolo is None:
+            _load_detector()
+
+
+def _load_detector() -> None:
+    global _yolo
     if YOLO is None:
         raise RuntimeError("ultralytics is not installed. pip install ultralytics")
     weights = settings.cv_detect_weights
     if not weights or not os.path.exists(weights):
         raise FileNotFoundError(f"Detect weights not found: {weights}")
+    exported = _exported_detector(weights) if settings.cv_detect_export else None
+    if exported:
+        try:
+            _yolo = YOLO(exported, task="detect")  # type: ignore[call-arg, misc]
+            return
+        except Exception as e:
+            log_action("viz_detect_export_error", "load", str(e))
     y: Any = YOLO(weights)  # type: ignore[call-arg]
     try:
         y.to(str(_device))  # ok to no-op on some builds
@@ -75,21 +161,234 @@ def _ensure_detector() -> None:
         pass
     _yolo = y
 
+class _OrtClassifier:
+    """Callable stand-in for the torch classifier: NCHW float tensor in, logits tensor out."""
+
+    def __init__(self, sess: Any):
+        self._sess = sess
+        self._input = sess.get_inputs()[0].name
+
+    def __call__(self, batch: Tensor) -> Tensor:
+        x = batch.detach().to("cpu", dtype=torch.float32).numpy()
+        return torch.from_numpy(self._sess.run(None, {self._input: x})[0])
+
+
+_CALIB_MAX = 32  # calibration/check images read from cv_clf_calib_dir
+_INT8_MIN_AGREE = 0.98  # top-1 agreement with the torch model required to use INT8
+
+
+def _calib_inputs(size: int) -> Optional[Any]:
+    """NCHW float32 batch of the images in cv_clf_calib_dir, preprocessed like _crop_tiles
+    (bilinear resize to size, [0,1], no normalization); None if there are none."""
+    d = getattr(settings, "cv_clf_calib_dir", "") or ""
+    if not os.path.isdir(d):
+        return None
+    tiles: List[Any] = []
+    for name in sorted(os.listdir(d)):
+        if len(tiles) >= _CALIB_MAX:
+            break
+        try:
+            with Image.open(os.path.join(d, name)) as im:
+                tiles.append(np.asarray(im.convert("RGB").resize((size, size), Image.BILINEAR)))
+        except Exception:
+            continue  # not an image
+    if not tiles:
+        return None
+    return np.ascontiguousarray(np.stack(tiles).transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+
+
+def _calib_stamp() -> str:
+    """Identifies the calibration set: cv_clf_calib_dir and the newest mtime in it
+    (the dir's own mtime covers added/removed files)."""
+    d = os.path.abspath(getattr(settings, "cv_clf_calib_dir", "") or "")
+    newest = os.path.getmtime(d)
+    for name in os.listdir(d):
+        newest = max(newest, os.path.getmtime(os.path.join(d, name)))
+    return f"{d}\n{newest!r}"
+
+
+def _int8_classifier(model: torch.nn.Module, ckpt_path: str) -> Optional[_OrtClassifier]:
+    """Export the classifier to ONNX, quantize it to INT8 QDQ once (static, calibrated on
+    cv_clf_calib_dir; cached beside the checkpoint, keyed by input size, with a stamp
+    file that rebuilds it when the calibration set changes) and open it on
+    the CPU provider. None on any failure, with no calibration images, or when its
+    top-1 disagrees with the torch model on them."""
+    size = int(settings.cv_clf_imgsz)
+    stem = os.path.splitext(ckpt_path)[0]
+    fp32_path = f"{stem}.{size}.onnx"
+    int8_path = f"{stem}.{size}.qdq.onnx"
+    stamp_path = int8_path + ".calib"
+    try:
+        calib = _calib_inputs(size)
+        if calib is None:
+            log_action("viz_clf_int8_skip", "calib=0", str(getattr(settings, "cv_clf_calib_dir", "")))
+            return None
+        import onnxruntime as ort  # type: ignore
+        stamp = _calib_stamp()
+        try:
+            with open(stamp_path, encoding="utf-8") as f:
+                fresh = f.read() == stamp
+        except OSError:
+            fresh = False
+        if not fresh or not os.path.exists(int8_path) or os.path.getmtime(int8_path) < os.path.getmtime(ckpt_path):
+            from onnxruntime.quantization import (  # type: ignore
+                CalibrationDataReader, QuantFormat, QuantType, quantize_static,
+            )
+
+            class _Reader(CalibrationDataReader):
+                def __init__(self) -> None:
+                    self._it = iter(calib[i:i + 1] for i in range(len(calib)))
+
+                def get_next(self) -> Optional[dict]:
+                    x = next(self._it, None)
+                    return None if x is None else {"input": x}
+
+            dummy = torch.zeros(1, 3, size, size)
+            torch.onnx.export(
+                model, (dummy,), fp32_path,
+                input_names=["input"], output_names=["logits"],
+                dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+                opset_version=17,
+            )
+            # Quantize to a temp file and swap it in, so an interrupted run can't leave a
+            # torn model behind a valid stamp
+            tmp_path = f"{stem}.{size}.qdq.tmp.onnx"
+            quantize_static(fp32_path, tmp_path, _Reader(), quant_format=QuantFormat.QDQ,
+                            activation_type=QuantType.QInt8, weight_type=QuantType.QInt8, per_channel=True)
+            os.replace(tmp_path, int8_path)
+            with open(stamp_path, "w", encoding="utf-8") as f:
+                f.write(stamp)
+            log_action("viz_clf_int8", f"size={size} calib={len(calib)}", int8_path)
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess = ort.InferenceSession(int8_path, sess_options=so, providers=["CPUExecutionProvider"])
+        q = _OrtClassifier(sess)
+
+        # Keep INT8 only if it picks the same cat as FP32 on the calibration photos
+        same = 0
+        with torch.inference_mode():
+            for i in range(0, len(calib), 8):
+                x = torch.from_numpy(calib[i:i + 8])
+                same += int((q(x).argmax(dim=1) == model(x).argmax(dim=1)).sum())
+        agree = same / len(calib)
+        if agree < _INT8_MIN_AGREE:
+            log_action("viz_clf_int8_reject", f"agree={agree:.3f}", int8_path)
+            return None
+        return q
+    except Exception as e:
+        log_action("viz_clf_int8_error", f"type={type(e).__name__}", str(e))
+        return None
+
+
+def _traced_classifier(model: torch.nn.Module) -> Any:
+    """Trace + freeze the eval model so identify() skips eager dispatch per layer.
+    Skipped when the forward runs under CUDA autocast (traced graphs don't pick up
+    autocast's casts reliably); any failure keeps the eager model."""
+    if _half and _device is not None and _device.type == "cuda":
+        return model
+    try:
+        size = int(settings.cv_clf_imgsz)
+        example = torch.zeros(1, 3, size, size, device=_device)
+        if _device is not None and _device.type == "cuda":
+            example = example.contiguous(memory_format=torch.channels_last)
+        with torch.no_grad():
+            traced = torch.jit.freeze(torch.jit.trace(model, example))
+            # batch dim stays dynamic for resnet; two runs let the profiling executor settle
+            traced(example)
+            traced(example)
+        return traced
+    except Exception as e:
+        log_action("viz_clf_jit_error", f"type={type(e).__name__}", str(e))
+        return model
+
+
+def _safetensors_path(ckpt_path: str) -> str:
+    return os.path.splitext(ckpt_path)[0] + ".safetensors"
+
+
+def _torch_load(ckpt_path: str, map_location: Any) -> Any:
+    try:
+        return torch.load(ckpt_path, map_location=map_location, weights_only=True)  # torch>=2.4
+    except TypeError:
+        # Older torch without weights_only
+        return torch.load(ckpt_path, map_location=map_location)
+
+
+def _load_classifier_state(ckpt_path: str) -> Any:
+    """Checkpoint state, preferring a sibling .safetensors (mmap'd, no pickle, loaded
+    straight onto the device) when one at least as new as the checkpoint exists.
+    Loading never writes files; see convert_classifier_to_safetensors."""
+    st_path = _safetensors_path(ckpt_path)
+    if os.path.exists(st_path) and os.path.getmtime(st_path) >= os.path.getmtime(ckpt_path):
+        try:
+            from safetensors.torch import load_file  # type: ignore
+            return load_file(st_path, device=str(_device))
+        except Exception as e:
+            log_action("viz_clf_safetensors_error", "load", str(e))
+    return _torch_load(ckpt_path, _device)
+
+
+def convert_classifier_to_safetensors(ckpt_path: Optional[str] = None) -> str:
+    """One-off: write the classifier checkpoint's tensors to a sibling .safetensors,
+    which _ensure_classifier then prefers. Run after replacing the weights:
+    python -m tomcat.vision.vision"""
+    from safetensors.torch import save_file  # type: ignore
+    ckpt_path = ckpt_path or settings.cv_classify_weights
+    state = _torch_load(ckpt_path, "cpu")
+    sd = state.get("state_dict", state) if isinstance(state, dict) else None
+    if not isinstance(sd, dict):
+        raise ValueError(f"No state dict in {ckpt_path}")
+    st_path = _safetensors_path(ckpt_path)
+    save_file({k: v.detach().contiguous() for k, v in sd.items() if isinstance(v, Tensor)}, st_path)
+    log_action("viz_clf_safetensors", "convert", st_path)
+    return st_path
+
+
+def _resnet18_skeleton(num_classes: int) -> torch.nn.Module:
+    """resnet18 with a num_classes head, ready for load_state_dict."""
+    from torchvision.models import resnet18
+    from torch import nn
+
+    model = resnet18(weights=None)
+    model.fc = nn.Linear(model.fc.in_features, num_classes)
+    return model
+
+
+def _warm_classifier(clf: Any, device: torch.device) -> None:
+    """One channels_last forward under the same autocast as _classify_tiles, so cuDNN's
+    benchmark autotuning happens at load rather than on the first identify()."""
+    try:
+        size = int(settings.cv_clf_imgsz)
+        x = torch.zeros(1, 3, size, size, device=device).contiguous(memory_format=torch.channels_last)
+        with torch.inference_mode(), torch.autocast(device_type=device.type, dtype=_amp_dtype, enabled=_half):
+            clf(x)
+        torch.cuda.synchronize(device)
+    except Exception as e:
+        log_action("viz_clf_warm_error", f"type={type(e).__name__}", str(e))
+
+
+# Same reasoning as _detector_lock: concurrent first identify() calls would each export
+# and quantize onto the same ONNX paths
+_classifier_lock = threading.Lock()
+
+
 def _ensure_classifier() -> None:
     """Load classifier lazily; never crash detector if classifier is bad."""
-    global _clf
     _ensure_device_only()
     if _clf is not None:
         return
+    with _classifier_lock:
+        if _clf is None:
+            _load_classifier()
+
+
+def _load_classifier() -> None:
+    global _clf
     try:
         ckpt_path = settings.cv_classify_weights
         if not ckpt_path or not os.path.exists(ckpt_path):
             return  # classifier is optional
-        try:
-            state = torch.load(ckpt_path, map_location=_device, weights_only=True)  # torch>=2.4
-        except TypeError:
-            # Older torch without weights_only
-            state = torch.load(ckpt_path, map_location=_device)
+        state = _load_classifier_state(ckpt_path)
 
         # Infer num_classes from checkpoint if possible
         sd = state.get("state_dict", state) if isinstance(state, dict) else state
@@ -105,20 +404,9 @@ def _ensure_classifier() -> None:
             # fallback to config length or 1
             num_classes = max(1, len(settings.cv_class_names) or 1)
 
-        # Build model head with the right class count
-        from torchvision.models import resnet18
-        from torch import nn
-
-        model = resnet18(weights=None)
-        model.fc = nn.Linear(model.fc.in_features, num_classes)
+        model = _resnet18_skeleton(num_classes)
         model.load_state_dict(sd if isinstance(sd, dict) else state, strict=False)
         model.eval()
-        model.to(_device)
-        if _half:
-            try:
-                model.half()
-            except Exception:
-                pass
 
         # Ensure class names length matches; fill with Cat{i}
         if len(settings.cv_class_names) < num_classes:
@@ -126,7 +414,24 @@ def _ensure_classifier() -> None:
                 [f"Cat{i}" for i in range(len(settings.cv_class_names), num_classes)]
             )
 
-        _clf = model
+        if settings.cv_clf_int8 and _device is not None and _device.type == "cpu":
+            q = _int8_classifier(model, ckpt_path)
+            if q is not None:
+                _clf = q
+                return
+
+        # Weights stay FP32; identify() runs the forward under autocast on CUDA
+        model.to(_device)
+        if _device is not None and _device.type == "cuda":
+            # Fixed HxW input, so let cuDNN pick the fastest conv algos; NHWC weights match
+            # the batch _tiles_to_batch builds (a permuted NHWC buffer is already channels_last)
+            torch.backends.cudnn.benchmark = True
+            model.to(memory_format=torch.channels_last)  # type: ignore[call-overload]
+
+        clf = _traced_classifier(model)
+        if _device is not None and _device.type == "cuda":
+            _warm_classifier(clf, _device)
+        _clf = clf
     except Exception as e:
         # Do NOT let a bad classifier kill detect/crop. Just log and continue.
         log_action("viz_clf_load_error", f"type={type(e).__name__}", str(e))
@@ -140,6 +445,16 @@ def _get_yolo() -> Any:
 
 
 def _jpeg_bytes(img: Image.Image, quality: int = 90) -> bytes:
+    if _tj is not None and img.mode == "RGB":
+        try:
+            kw: dict = {}
+            if TJFLAG_OPTIMIZE:
+                # optimized Huffman tables, like Pillow's optimize=True, where the binding has them
+                kw["flags"] = TJFLAG_OPTIMIZE
+            return _tj.encode(np.asarray(img), quality=quality, pixel_format=TJPF_RGB,
+                              jpeg_subsample=TJSAMP_420, **kw)
+        except Exception:
+            pass  # fall through to Pillow
     buf = io.BytesIO()
     img.save(buf, format="JPEG", quality=quality, optimize=True)
     return buf.getvalue()
@@ -156,33 +471,6 @@ def _enforce_max_dim(img: Image.Image) -> None:
         )
 
 
-
-def _resize_for_detect(img: Image.Image, detect_size: int) -> Tuple[Image.Image, float, float]:
-    w, h = img.size
-    if w <= 0 or h <= 0:
-        return img, 1.0, 1.0
-    if w < h:
-        new_w = detect_size
-        new_h = int(round(h * (detect_size / w)))
-    else:
-        new_h = detect_size
-        new_w = int(round(w * (detect_size / h)))
-    det = img.resize((new_w, new_h))
-    return det, (w / new_w), (h / new_h)
-
-
-def _expand_box(x1: float, y1: float, x2: float, y2: float, pad_pct: float, w: int, h: int) -> Tuple[int, int, int, int]:
-    bw = x2 - x1
-    bh = y2 - y1
-    pad_x = bw * pad_pct
-    pad_y = bh * pad_pct
-    nx1 = max(0, int(math.floor(x1 - pad_x)))
-    ny1 = max(0, int(math.floor(y1 - pad_y)))
-    nx2 = min(w, int(math.ceil(x2 + pad_x)))
-    ny2 = min(h, int(math.ceil(y2 + pad_y)))
-    return nx1, ny1, nx2, ny2
-
-
 @dataclass
 class Det:
     xyxy: Tuple[float, float, float, float]
@@ -195,12 +483,42 @@ class IdentifyResult:
     results: List[dict]  # [{"index": 1, "name": "...", "conf": 0.87, "box": [x1,y1,x2,y2]}]
 
 
+# Rendered "1".."64" label tiles (purple box + white number); labels never change,
+# so each is rasterized once and pasted afterwards
+_LABEL_TILE_MAX = 64
+_label_tiles: dict[int, Image.Image] = {}
+
+
+def _label_tile(idx: int) -> Image.Image:
+    tile = _label_tiles.get(idx)
+    if tile is not None:
+        return tile
+    font = _load_font()
+    label = f"{idx}"
+    probe = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    try:
+        bbox = probe.textbbox((0, 0), label, font=font)  # type: ignore[attr-defined]
+        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    except Exception:
+        tw, th = probe.textsize(label, font=font)  # type: ignore[attr-defined]
+    pad = 4
+    # +1: the old rectangle() call filled both end coordinates
+    tile = Image.new("RGB", (tw + 2 * pad + 1, th + 2 * pad + 1), _PURPLE)
+    ImageDraw.Draw(tile).text((pad, pad), label, fill="white", font=font)
+    _label_tiles[idx] = tile
+    return tile
+
+
 def _draw_boxes(img: Image.Image, dets: List[Det]) -> Image.Image:
     draw = ImageDraw.Draw(img)
     font = _load_font()
     for idx, d in enumerate(dets, start=1):
         x1, y1, x2, y2 = d.xyxy
         draw.rectangle([x1, y1, x2, y2], outline=_PURPLE, width=3)
+        if idx <= _LABEL_TILE_MAX:
+            tile = _label_tile(idx)
+            img.paste(tile, (int(x1), int(max(0, y1 - (tile.size[1] - 1)))))
+            continue
         label = f"{idx}"
         # textbbox may not exist on very old Pillow; fallback to textsize
         try:
@@ -216,15 +534,11 @@ def _draw_boxes(img: Image.Image, dets: List[Det]) -> Image.Image:
     return img
 
 
-def _run_yolo(img: Image.Image) -> List[Det]:
-    """Run YOLO on a PIL image, returning boxes scaled to the original image coordinates."""
-    yolo = _get_yolo()
-    det_img, sx, sy = _resize_for_detect(img, settings.cv_detect_imgsz)
-
+def _predict(yolo: Any, src: Any) -> Any:
     # Prefer predict API so we can pass conf/iou/half/device explicitly.
     try:
-        res = yolo.predict(  # type: ignore[call-arg, attr-defined]
-            det_img,
+        return yolo.predict(  # type: ignore[call-arg, attr-defined]
+            src,
             conf=(settings.cv_conf or _DEFAULT_CONF),
             iou=settings.cv_iou,
             imgsz=settings.cv_detect_imgsz,
@@ -234,20 +548,25 @@ def _run_yolo(img: Image.Image) -> List[Det]:
         )
     except TypeError:
         # Fallback to call-style for older ultralytics versions
-        res = yolo(det_img)  # type: ignore[operator]
-
-    dets: List[Det] = []
-    for r in res:  # ultralytics returns an iterable of results
-        boxes = r.boxes.xyxy.detach().to("cpu").numpy()
-        confs = r.boxes.conf.detach().to("cpu").numpy()
-        for b, c in zip(boxes, confs):
-            if float(c) >= (settings.cv_conf or _DEFAULT_CONF):
-                x1 = float(b[0] * sx)
-                y1 = float(b[1] * sy)
-                x2 = float(b[2] * sx)
-                y2 = float(b[3] * sy)
-                dets.append(Det((x1, y1, x2, y2), float(c)))
-    return dets
+        return yolo(src)  # type: ignore[operator]
+
+
+def _run_yolo(img: Image.Image) -> List[Det]:
+    """Run YOLO on a PIL image, returning boxes scaled to the original image coordinates."""
+    yolo = _get_yolo()
+    # The original goes straight in: ultralytics letterboxes to imgsz once and returns
+    # boxes in source-image coordinates, so no pre-resize and no rescale
+    r = _predict(yolo, img)[0]
+    boxes = r.boxes.xyxy.detach().to("cpu").numpy()
+    confs = r.boxes.conf.detach().to("cpu").numpy()
+    keep = confs >= (settings.cv_conf or _DEFAULT_CONF)
+    return [Det((x1, y1, x2, y2), c) for (x1, y1, x2, y2), c in zip(boxes[keep].tolist(), confs[keep].tolist())]
+
+
+def _passthrough_ok(image_bytes: bytes) -> bool:
+    """With nothing to draw, the annotated output would just be the input re-encoded;
+    send a JPEG upload back unchanged when it's small enough to re-post."""
+    return image_bytes.startswith(b"\xff\xd8") and len(image_bytes) < int(getattr(settings, "cv_max_return_bytes", 0) or 0)
 
 
 def detect(image_bytes: bytes) -> bytes:
@@ -255,39 +574,141 @@ def detect(image_bytes: bytes) -> bytes:
     img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
     _enforce_max_dim(img)
     dets = _run_yolo(img)
-    annotated = _draw_boxes(img.copy(), dets)
+    if not dets and _passthrough_ok(image_bytes):
+        log_action("viz_detect", "boxes=0", "ok")
+        return image_bytes
+    annotated = _draw_boxes(img, dets)  # img isn't needed unannotated after detection
     out = _jpeg_bytes(annotated, quality=90)
     log_action("viz_detect", f"boxes={len(dets)}", "ok")
     return out
 
 
+def _lossless_jpeg_crops(image_bytes: bytes, boxes: List[List[int]]) -> Optional[List[bytes]]:
+    """Cut crops straight out of the source JPEG with libjpeg-turbo's lossless transform:
+    no pixel decode and no re-encode. Box origins snap down to the MCU grid (the
+    transform can only start there), so a crop can grow by up to 15 px on the top/left
+    (7 px for 4:4:4) compared with the PIL path; right/bottom edges are unchanged.
+    EXIF and other markers are not copied, matching the PIL re-encode.
+    None if this isn't a plain YCbCr/grayscale JPEG (CMYK/YCCK crops would come back
+    CMYK where the PIL path returns RGB) or TurboJPEG is unavailable."""
+    if _tj is None or not image_bytes.startswith(b"\xff\xd8"):
+        return None
+    try:
+        w, h, subsample, colorspace = _tj.decode_header(image_bytes)
+        if colorspace not in (TJCS_YCbCr, TJCS_GRAY):
+            return None
+        mcu = {TJSAMP_444: (8, 8), TJSAMP_422: (16, 8), TJSAMP_420: (16, 16),
+               TJSAMP_440: (8, 16), TJSAMP_GRAY: (8, 8)}.get(subsample)
+        if mcu is None:
+            return None
+        out: List[bytes] = []
+        for x1, y1, x2, y2 in boxes:
+            x1 = min(x1, w - 1) // mcu[0] * mcu[0]
+            y1 = min(y1, h - 1) // mcu[1] * mcu[1]
+            x2, y2 = min(x2, w), min(y2, h)
+            out.append(_tj.crop(image_bytes, x1, y1, max(1, x2 - x1), max(1, y2 - y1), copynone=True))
+        return out
+    except Exception as e:
+        log_action("viz_crop_lossless_error", f"type={type(e).__name__}", str(e))
+        return None
+
+
 def crop(image_bytes: bytes) -> List[bytes]:
     """Return list of JPEG crops expanded by pad_pct per v5.6."""
     img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
     _enforce_max_dim(img)
     dets = _run_yolo(img)
+    boxes = expand_boxes([d.xyxy for d in dets], settings.cv_pad_pct, *img.size).tolist()
+    fast = _lossless_jpeg_crops(image_bytes, boxes) if boxes else None
+    if fast is not None:
+        log_action("viz_crop", f"crops={len(fast)}", "ok")
+        return fast
     crops: List[bytes] = []
-    for d in dets:
-        x1, y1, x2, y2 = d.xyxy
-        cx1, cy1, cx2, cy2 = _expand_box(x1, y1, x2, y2, settings.cv_pad_pct, *img.size)
-        crop_img = img.crop((cx1, cy1, cx2, cy2))
+    for box in boxes:
+        crop_img = img.crop(tuple(box))
         crops.append(_jpeg_bytes(crop_img, quality=92))
     log_action("viz_crop", f"crops={len(crops)}", "ok")
     return crops
 
 
-def _prep_tensor(pil: Image.Image) -> Tensor:
-    """Resize square and convert to a Tensor. v5.6 parity: no ImageNet normalization."""
-    from torchvision.transforms import Compose, Resize, ToTensor  # local import to avoid global hard deps
+def _tiles_to_batch(tiles: List[Any], device: torch.device) -> Tensor:
+    """Stack HWC uint8 tiles into one NCHW float batch on device.
+    v5.6 parity: values in [0,1] like ToTensor, no ImageNet normalization. The single
+    host→device copy moves uint8 (4× fewer bytes than float) and converts on device."""
+    host = _host_tiles(tiles, pinned=(device.type == "cuda"))
+    return host.to(device, non_blocking=True).permute(0, 3, 1, 2).float().div_(255.0)
+
+
+# Reused NHWC uint8 staging buffer (pinned on CUDA) so a batch isn't a fresh stack +
+# pin_memory every call. Grows to the next power of two; guarded by _classify_lock.
+_host_buf: Optional[Tensor] = None
+_classify_lock = threading.Lock()
+
+
+def _host_tiles(tiles: List[Any], pinned: bool) -> Tensor:
+    global _host_buf
+    n = len(tiles)
+    shape = tuple(tiles[0].shape)
+    buf = _host_buf
+    if buf is None or buf.shape[0] < n or tuple(buf.shape[1:]) != shape or buf.is_pinned() != pinned:
+        buf = torch.empty((1 << (n - 1).bit_length(), *shape), dtype=torch.uint8, pin_memory=pinned)
+        _host_buf = buf
+    view = buf.numpy()
+    for i, t in enumerate(tiles):
+        view[i] = t
+    return buf[:n]
+
+
+def _classify_tiles(tiles: List[Any]) -> Any:
+    """Run the classifier over HWC uint8 tiles; returns numpy (top-1 prob, top-1 class)
+    per tile. Softmax and argmax stay on the device so only 2×N values come back."""
+    device = _device if _device is not None else torch.device("cpu")
+    # One batch at a time: the staging buffer is shared and the GPU runs them serially anyway
+    with _classify_lock:
+        # FP16/BF16 tensor-core math on CUDA via autocast; softmax runs on FP32 logits
+        with torch.inference_mode(), torch.autocast(device_type=device.type, dtype=_amp_dtype,
+                                                    enabled=(_half and device.type == "cuda")):
+            batch = _tiles_to_batch(tiles, device)
+            logits = _clf(batch)  # type: ignore[operator]
+        conf, idx = torch.softmax(logits.float(), dim=1).max(dim=1)
+        # .to("cpu") syncs, so the staging buffer is free again before the lock drops
+        return conf.to("cpu").numpy(), idx.to("cpu").numpy()
+
+
+def _crop_tiles(img: Image.Image, dets: List[Det]) -> Tuple[List[Any], List[Tuple[int, int, int, int]]]:
     size = settings.cv_clf_imgsz
-    tfm = Compose([Resize((size, size)), ToTensor()])
-    t = cast(Tensor, tfm(pil))
-    if _half:
-        try:
-            t = t.half()
-        except Exception:
-            pass
-    return t
+    tiles: List[Any] = []
+    boxes: List[Tuple[int, int, int, int]] = []
+    for cx1, cy1, cx2, cy2 in expand_boxes([d.xyxy for d in dets], settings.cv_pad_pct, *img.size).tolist():
+        crop_img = img.crop((cx1, cy1, cx2, cy2))
+        # Same bilinear PIL resize torchvision's Resize did, kept as uint8
+        tiles.append(np.asarray(crop_img.resize((size, size), Image.BILINEAR)))
+        boxes.append((int(cx1), int(cy1), int(cx2), int(cy2)))
+    return tiles, boxes
+
+
+def _guesses(top: Tuple[Any, Any], boxes: List[Tuple[int, int, int, int]]) -> List[dict]:
+    names = settings.cv_class_names or []
+    results: List[dict] = []
+    for idx, (conf, j, (cx1, cy1, cx2, cy2)) in enumerate(zip(top[0].tolist(), top[1].tolist(), boxes), start=1):
+        guess = names[j] if j < len(names) else f"Cat{j}"
+        results.append({
+            "index": idx,
+            "name": guess,
+            "conf": conf,
+            "box": [cx1, cy1, cx2, cy2],
+        })
+    return results
+
+
+# Small dedicated pool: identify() already runs on a worker thread, and sharing the
+# Sheets/log pool could leave it waiting behind slow HTTP calls
+_ENCODE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tomcat-jpeg")
+
+
+def _annotated_jpeg(img: Image.Image, dets: List[Det]) -> bytes:
+    # Drawn on the decoded image itself; callers cut their tiles first
+    return _jpeg_bytes(_draw_boxes(img, dets), quality=90)
 
 
 def identify(image_bytes: bytes) -> IdentifyResult:
@@ -296,40 +717,20 @@ def identify(image_bytes: bytes) -> IdentifyResult:
     _enforce_max_dim(img)
     _ensure_classifier()
     dets = _run_yolo(img)
-    annotated = _draw_boxes(img.copy(), dets)
-
-    results: List[dict] = []        
-
-    if _clf is not None and dets:
-        tiles: List[Tensor] = []
-        boxes: List[Tuple[int, int, int, int]] = []
-        for d in dets:
-            x1, y1, x2, y2 = d.xyxy
-            cx1, cy1, cx2, cy2 = _expand_box(x1, y1, x2, y2, settings.cv_pad_pct, *img.size)
-            crop_img = img.crop((cx1, cy1, cx2, cy2))
-            tiles.append(_prep_tensor(crop_img))
-            boxes.append((int(cx1), int(cy1), int(cx2), int(cy2)))
-
-        if tiles:
-            with torch.inference_mode():
-                device = _device if _device is not None else torch.device("cpu")
-                batch = torch.stack(tiles, dim=0).to(device, non_blocking=True)
-                logits = _clf(batch)  # type: ignore[operator]
-                probs = torch.softmax(logits, dim=1).detach().to("cpu").numpy()
-
-            names = settings.cv_class_names or []
-            for idx, (pvec, (cx1, cy1, cx2, cy2)) in enumerate(zip(probs, boxes), start=1):
-                j = int(pvec.argmax())
-                conf = float(pvec[j])
-                guess = names[j] if j < len(names) else f"Cat{j}"
-                results.append({
-                    "index": idx,
-                    "name": guess,
-                    "conf": conf,
-                    "box": [cx1, cy1, cx2, cy2],
-                })
-
-    boxed = _jpeg_bytes(annotated, quality=90)
+
+    tiles: List[Any] = []
+    boxes: List[Tuple[int, int, int, int]] = []
+    if _clf is not None:
+        tiles, boxes = _crop_tiles(img, dets)
+
+    # Tiles are cut, so annotate + encode on the side while the classifier runs
+    # (torch and the JPEG encoders release the GIL)
+    job = None if not dets and _passthrough_ok(image_bytes) else _ENCODE_POOL.submit(_annotated_jpeg, img, dets)
+    results = _guesses(_classify_tiles(tiles), boxes) if tiles else []
+    boxed = image_bytes if job is None else job.result()
     log_action("viz_identify", f"boxes={len(dets)} guesses={len(results)}", "ok")
     return IdentifyResult(boxed_jpeg=boxed, results=results)
 
+
+if __name__ == "__main__":
+    print(convert_classifier_to_safetensors())